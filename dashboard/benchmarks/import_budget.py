@@ -0,0 +1,78 @@
+'''
+Cek waktu import (cold start) dan modul berat yang tidak boleh ikut dimuat
+
+Contoh (dijalankan dari root repo):
+    python dashboard/benchmarks/import_budget.py
+Keluar dengan kode 1 jika ada budget yang terlampaui.
+'''
+import json
+import os
+import subprocess
+import sys
+
+DASHBOARD_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ['tensorflow', 'keras', 'sklearn', 'matplotlib', 'seaborn', 'folium',
+                 'streamlit_folium', 'openpyxl']
+
+# Modul yang diukur: (modul yang di-import, budget detik, modul berat yang dilarang)
+BUDGETS = {
+    # Halaman komoditas hanya menampilkan hasil yang sudah dihitung
+    'viewer page': (['visual.page'], 3.0, HEAVY_MODULES),
+    # Entry module dashboard_1 sendiri, model baru dimuat saat forecast diminta
+    'forecast app': (
+        ['dashboard_1'],
+        1.5, ['tensorflow', 'keras', 'sklearn', 'matplotlib', 'seaborn', 'folium'],
+    ),
+    # Engine NumPy tidak boleh menyentuh TensorFlow
+    'numpy engine': (['forecast_data.numpy_lstm'], 1.0, ['tensorflow', 'keras', 'h5py']),
+}
+
+MEASURE_CODE = '''
+import importlib, json, sys, time
+modules, heavy = json.loads(sys.argv[1]), json.loads(sys.argv[2])
+start = time.perf_counter()
+for module in modules:
+    importlib.import_module(module)
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "loaded": [m for m in heavy if m in sys.modules]}))
+'''
+
+def measure(modules, heavy, repeat=3):
+    '''
+    Mengukur waktu import di proses Python baru, diambil yang tercepat
+    dari beberapa percobaan agar tidak terpengaruh cache disk
+    '''
+    env = dict(os.environ, PYTHONPATH=DASHBOARD_DIR)
+    results = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', MEASURE_CODE, json.dumps(modules), json.dumps(heavy)],
+            cwd=os.path.dirname(DASHBOARD_DIR), env=env,
+            capture_output=True, text=True, check=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    return min(results, key=lambda result: result['seconds'])
+
+def check_budgets(budgets=None):
+    '''Menjalankan semua pengukuran, mengembalikan list pelanggaran'''
+    failures = []
+    for name, (modules, budget, heavy) in (budgets or BUDGETS).items():
+        result = measure(modules, heavy)
+        status = 'OK'
+        if result['seconds'] > budget:
+            status = 'LAMBAT'
+            failures.append(f"{name}: {result['seconds']:.2f}s > {budget:.2f}s")
+        if result['loaded']:
+            status = 'BERAT'
+            failures.append(f"{name}: memuat {', '.join(result['loaded'])}")
+        print(f"{status:6} {name:14} {result['seconds']:.3f}s (budget {budget:.1f}s)")
+
+    return failures
+
+if __name__ == "__main__":
+    budget_failures = check_budgets()
+    for failure in budget_failures:
+        print(f"Gagal: {failure}")
+    sys.exit(1 if budget_failures else 0)
@@ -0,0 +1,215 @@
+'''
+Benchmark pipeline peramalan dengan data historis sintetis berskala besar
+
+Setiap skenario membuat data harga acak (random walk) untuk sejumlah
+seri dan hari, dikelompokkan per komoditas berisi MARKETS_PER_COMMODITY
+pasar, lalu mengukur setiap tahap pipeline. Hasil dibandingkan dengan
+baseline.json; tahap yang lebih lambat dari toleransi dianggap regresi.
+
+Contoh (dijalankan dari root repo):
+    PYTHONPATH=dashboard python -m benchmarks.suite            # cek regresi
+    PYTHONPATH=dashboard python -m benchmarks.suite --quick    # skenario kecil saja
+    PYTHONPATH=dashboard python -m benchmarks.suite --save     # tulis ulang baseline
+Keluar dengan kode 1 jika ada regresi.
+'''
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from prepare_data.hist_data import import_data
+from prepare_data.preprocess import load_scaled_data
+from forecast_data.artifact import read_artifact, write_artifact
+from forecast_data.engine import load_forecast_model
+from forecast_data.forecast import make_forecast_batch
+from forecast_data.merge import merge_market_forecasts
+from visual.page import prepare_table
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+MARKETS_PER_COMMODITY = 10
+FORECAST_STEPS = 93
+
+# Skenario: (jumlah seri, jumlah hari)
+SCENARIOS = {
+    'small': (10, 1_000),
+    'medium': (100, 10_000),
+    'wide': (1_000, 1_000),
+    'long': (10, 100_000),
+}
+QUICK_SCENARIOS = ('small',)
+
+def make_histories(data_dir, n_series, n_days, seed=0):
+    '''
+    Method ini menulis CSV sintetis (kolom tanggal + satu kolom per pasar)
+    dan mengembalikan list (path, kolom pasar) per komoditas
+    '''
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('1900-01-01', periods=n_days, freq='D')
+    histories = []
+    for start in range(0, n_series, MARKETS_PER_COMMODITY):
+        markets = [f"pasar {i}" for i in range(start, min(start + MARKETS_PER_COMMODITY, n_series))]
+        steps = rng.normal(0, 250, (n_days, len(markets)))
+        prices = np.abs(30_000 + np.cumsum(steps, axis=0)) + 1_000
+        df = pd.DataFrame(prices.round(), index=dates, columns=markets)
+        df.index.name = 'tanggal'
+
+        path = os.path.join(data_dir, f"komoditas_{start // MARKETS_PER_COMMODITY}.csv")
+        df.to_csv(path)
+        histories.append((path, markets))
+
+    return histories
+
+def best_time(function, repeat):
+    '''Waktu tercepat dari beberapa kali pemanggilan, beserta hasil terakhir'''
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+
+    return best, result
+
+def run_scenario(n_series, n_days, model, work_dir, repeat=3):
+    '''Mengukur setiap tahap pipeline untuk satu skenario, hasil dalam detik'''
+    data_dir = os.path.join(work_dir, 'data')
+    cache_dir = os.path.join(work_dir, 'cache')
+    artifact_dir = os.path.join(work_dir, 'artifact')
+    for directory in (data_dir, cache_dir, artifact_dir):
+        os.makedirs(directory)
+    histories = make_histories(data_dir, n_series, n_days)
+
+    timings = {}
+    timings['import_data'], _ = best_time(
+        lambda: [import_data(path) for path, _ in histories], repeat
+    )
+
+    # Cache preprocessing dibuat sekali, yang diukur pemuatan dari cache
+    for path, markets in histories:
+        load_scaled_data(path, markets, cache_dir)
+    timings['load_scaled'], scaled = best_time(
+        lambda: [load_scaled_data(path, markets, cache_dir) for path, markets in histories], repeat
+    )
+
+    series = [
+        (df_scaled, market, scalers[market])
+        for (_, markets), (df_scaled, scalers) in zip(histories, scaled)
+        for market in markets
+    ]
+    timings['make_forecast'], forecasts = best_time(
+        lambda: make_forecast_batch(series, model, FORECAST_STEPS), repeat
+    )
+
+    def merge_all():
+        merged, offset = [], 0
+        for _, markets in histories:
+            merged.append(merge_market_forecasts(forecasts[offset:offset + len(markets)], markets))
+            offset += len(markets)
+        return merged
+    timings['merge'], merged = best_time(merge_all, repeat)
+
+    artifact_paths = [os.path.join(artifact_dir, f"{i}.forecast") for i in range(len(merged))]
+    timings['artifact_write'], _ = best_time(
+        lambda: [write_artifact(df, path) for df, path in zip(merged, artifact_paths)], repeat
+    )
+    timings['artifact_read'], tables = best_time(
+        lambda: [read_artifact(path)[0] for path in artifact_paths], repeat
+    )
+
+    # Halaman dashboard memakai index Date; yang diukur filter + satu halaman tabel
+    tables = [df.set_index('Date') for df in tables]
+    timings['page_prep'], _ = best_time(lambda: [
+        prepare_table(df, markets, df.index[0].date(), df.index[-1].date())
+        for df, (_, markets) in zip(tables, histories)
+    ], repeat)
+
+    return timings
+
+def run_suite(scenarios, engine='numpy', repeat=3):
+    '''Menjalankan semua skenario, hasil {"skenario/tahap": detik}'''
+    model = load_forecast_model(engine)
+    results = {}
+    for name in scenarios:
+        n_series, n_days = SCENARIOS[name]
+        work_dir = tempfile.mkdtemp(prefix=f"forecast-bench-{name}-")
+        try:
+            for stage, seconds in run_scenario(n_series, n_days, model, work_dir, repeat).items():
+                results[f"{name}/{stage}"] = round(seconds, 6)
+                print(f"{name:8} {stage:15} {seconds * 1000:10.1f} ms", flush=True)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+def environment_info(engine):
+    '''Informasi mesin yang ikut disimpan di baseline'''
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'engine': engine,
+    }
+
+def compare(results, baseline, tolerance=0.5, min_delta=0.02):
+    '''
+    Membandingkan hasil dengan baseline. Tahap dianggap regresi jika lebih
+    lambat dari baseline * (1 + tolerance) dan selisihnya lebih dari
+    min_delta detik (menghindari noise pada tahap yang sangat cepat).
+    '''
+    regressions = []
+    for key, seconds in results.items():
+        expected = baseline['results'].get(key)
+        if expected is None:
+            continue
+        if seconds > expected * (1 + tolerance) and seconds - expected > min_delta:
+            regressions.append(f"{key}: {seconds * 1000:.1f} ms (baseline {expected * 1000:.1f} ms)")
+
+    return regressions
+
+def main():
+    '''
+    Fungsi utama command line
+    '''
+    parser = argparse.ArgumentParser(description="Benchmark pipeline peramalan")
+    parser.add_argument("--quick", action="store_true", help="Hanya skenario kecil")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS))
+    parser.add_argument("--engine", choices=["numpy", "tflite", "keras"], default="numpy")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Batas perlambatan relatif terhadap baseline")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save", action="store_true", help="Simpan hasil sebagai baseline")
+    args = parser.parse_args()
+
+    scenarios = args.scenario or (QUICK_SCENARIOS if args.quick else list(SCENARIOS))
+    results = run_suite(scenarios, args.engine, args.repeat)
+
+    if args.save:
+        baseline = {'environment': environment_info(args.engine), 'results': {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding='utf-8') as file:
+                baseline['results'] = json.load(file)['results']
+        baseline['results'].update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(baseline, file, indent=1, sort_keys=True)
+        print(f"Baseline disimpan di {args.baseline}")
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as file:
+        baseline = json.load(file)
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"Regresi: {regression}")
+
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,2 +1,4 @@
+from . import commodity
 from . import data
-from . import model
\ No newline at end of file
+from . import metrics
+from . import model
@@ -0,0 +1,41 @@
+'''
+Registry komoditas dan pasar yang ditampilkan di dashboard
+
+Isi registry dibaca dari catalog.json. Setiap komoditas berisi file
+historis (CSV dengan kolom tanggal dan satu kolom per pasar) dan daftar
+pasar; satu seri = satu pasangan (komoditas, pasar). Path relatif
+terhadap data.BASE_PATH (atau path absolut), file turunan (artifact forecast dan Excel)
+mengikuti nama key komoditas.
+'''
+import json
+import os
+from . import data
+
+# File katalog seri, bisa diganti lewat environment variable
+CATALOG_FILE = os.environ.get(
+    "FORECAST_CATALOG", os.path.join(os.path.dirname(__file__), "catalog.json")
+)
+
+def load_catalog(path=CATALOG_FILE):
+    '''Membaca katalog dan melengkapi path setiap komoditas'''
+    with open(path, encoding='utf-8') as file:
+        catalog = json.load(file)
+
+    markets = catalog['markets']
+    commodities = {}
+    for key, commodity in catalog['commodities'].items():
+        for market in commodity['markets']:
+            markets.setdefault(market, {'label': market.title()})
+        commodities[key] = {
+            'title': commodity['title'],
+            'history': os.path.join(data.BASE_PATH, commodity['history']),
+            'forecast': f"{data.BASE_PATH}/data_{key}.forecast",
+            'excel': f"{data.BASE_PATH}/data_{key}.xlsx",
+            'markets': list(commodity['markets']),
+        }
+
+    return catalog['map_center'], markets, commodities
+
+# Titik tengah peta, pasar tradisional (key = nama kolom di data historis)
+# dan komoditas (key dipakai oleh halaman di folder pages)
+MAP_CENTER, MARKETS, COMMODITIES = load_catalog()
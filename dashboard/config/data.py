@@ -6,3 +6,16 @@ DATA_BAWANG_MERAH = f"{BASE_PATH}/data_bawang_merah_clean23.csv"
 
 # Name of the DATA file
 DATA_DAGING_AYAM = f"{BASE_PATH}/data_daging_ayam_clean23.csv"
+
+# Forecast artifacts (columnar NumPy) written by the dashboard, read by the pages
+FORECAST_BAWANG_MERAH = f"{BASE_PATH}/data_bawang_merah.forecast"
+FORECAST_DAGING_AYAM = f"{BASE_PATH}/data_daging_ayam.forecast"
+
+# Consolidated forecast of every series in the catalog (long format)
+FORECAST_ALL = f"{BASE_PATH}/forecast_all.forecast"
+
+# Cache of preprocessed (scaled) series, keyed by the content hash of each CSV
+CACHE_PATH = "./dashboard/cache"
+
+# Persisted results of background forecast jobs, keyed by (horizon, data, model)
+JOB_RESULT_PATH = f"{CACHE_PATH}/jobs"
@@ -0,0 +1,5 @@
+# Record stage timings for forecast runs (can also be enabled per run from the UI/CLI)
+METRICS_ENABLED = False
+
+# JSON lines log, one record per forecast run
+METRICS_LOG = "./dashboard/logs/metrics.jsonl"
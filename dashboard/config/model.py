@@ -4,5 +4,32 @@ BASE_PATH = "./dashboard/models"
 # Name of the model file
 MODEL_FILE_NAME = f"{BASE_PATH}/bestModel_lstm.h5"
 
+# Retrained models are saved as <prefix>-v<N>.h5 with a <prefix>-v<N>.json sidecar
+TRAINED_MODEL_PREFIX = f"{BASE_PATH}/lstm"
+
 # Name of the scale file
 SCALE_FILE_NAME = f"{BASE_PATH}/scaler.pkl"
+
+# Forecast engine: "numpy" (tanpa TensorFlow), "tflite", "keras", "service" atau "ensemble"
+FORECAST_ENGINE = "numpy"
+
+# Directory of model files (.h5, same architecture) averaged by the "ensemble" engine
+ENSEMBLE_MODEL_DIR = f"{BASE_PATH}/ensemble"
+
+# TFLite engine quantization: "float16" atau "int8" (dynamic-range)
+TFLITE_QUANTIZATION = "float16"
+
+# Maximum memory (bytes) for the in-process forecast cache
+FORECAST_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Local forecast service (FORECAST_ENGINE = "service" untuk memakainya)
+FORECAST_SERVICE_HOST = "127.0.0.1"
+FORECAST_SERVICE_PORT = 8765
+FORECAST_SERVICE_URL = f"http://{FORECAST_SERVICE_HOST}:{FORECAST_SERVICE_PORT}"
+# Batas langkah per request dan detik menunggu hasil batch sebelum request gagal
+FORECAST_SERVICE_MAX_STEPS = 3650
+FORECAST_SERVICE_TIMEOUT = 60
+
+# Prediction intervals: quantiles and number of bootstrap sample paths per series
+FORECAST_QUANTILES = (0.1, 0.5, 0.9)
+FORECAST_SAMPLES = 500
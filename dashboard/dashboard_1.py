@@ -4,47 +4,34 @@ di Pasar Tradisional Kabupaten Banyumas
 '''
 
 import streamlit as st
-from keras.models import load_model
-from sklearn.preprocessing import MinMaxScaler
-import config.model as model_config
 import config.data as data_config
-from prepare_data.hist_data import import_data
-from forecast_data.forecast import make_forecast
-from forecast_data.merge import merge_forecast_data
-import tensorflow as tf
-
-# set tensorflow to run only on cpu
-tf.config.set_visible_devices([], 'GPU')
+import config.metrics as metrics_config
+import config.model as model_config
+from forecast_data.pipeline import data_version, forecast_job, publish
+from forecast_data.engine import load_forecast_model, model_fingerprint
+from forecast_data.cache import ForecastCache
+from forecast_data.jobs import JobManager
+from instrument.timing import timing_run
+from visual.job_status import render_job_status, request_job
 
 # data model dan histori data
 MODEL_PATH = model_config.MODEL_FILE_NAME
-DATA_BAWANG = data_config.DATA_BAWANG_MERAH
-DATA_AYAM = data_config.DATA_DAGING_AYAM
+FORECAST_ENGINE = model_config.FORECAST_ENGINE
 
-@st.cache_resource
-def load_lstm_model(model_path):
+@st.cache_resource(show_spinner=False)
+def load_lstm_model(model_path, engine):
     '''Cache the model loading to avoid reloading on every run'''
-    return load_model(model_path)
-
-@st.cache_data
-def load_and_scale_data(data_path):
-    '''Cache data loading and scaling to avoid reprocessing'''
-    df = import_data(data_path)
-    scale = MinMaxScaler()
-    
-    # Fit scaler on both columns together for consistency
-    df_scaled = df.copy()
-    df_scaled['pasar manis'] = scale.fit_transform(df[['pasar manis']])
-    df_scaled['pasar wage'] = scale.fit_transform(df[['pasar wage']])
-    
-    return df_scaled, scale
+    return load_forecast_model(engine, model_path)
 
-# Load Model (cached)
-loaded_model = load_lstm_model(MODEL_PATH)
+@st.cache_resource
+def load_forecast_cache(model_path, engine):
+    '''Cache hasil peramalan dibagi antar sesi dan rerun'''
+    return ForecastCache(model_config.FORECAST_CACHE_MAX_BYTES), model_fingerprint(engine, model_path)
 
-# Import and scale data (cached)
-df_bawang, scale_bawang = load_and_scale_data(DATA_BAWANG)
-df_ayam, scale_ayam = load_and_scale_data(DATA_AYAM)
+@st.cache_resource
+def load_job_manager():
+    '''Job manager dibagi antar sesi, request yang sama dihitung sekali'''
+    return JobManager(data_config.JOB_RESULT_PATH)
 
 st.set_page_config(layout="wide")
 st.header('Model Peramalan Harga Komoditas Pangan (LSTM) :sparkles:')
@@ -56,41 +43,42 @@ def main():
     '''
     # tampilan awal
     st.write("Jumlah hari yang akan diprediksi : ", forecast_days)
-    st.write("Forecast data....")
-
-    # Buat forecast data
-    bawang_pm = make_forecast(df_bawang,'pasar manis', loaded_model, scale_bawang, forecast_days)
-    bawang_pw = make_forecast(df_bawang,'pasar wage', loaded_model, scale_bawang, forecast_days)
-    ayam_pm = make_forecast(df_ayam,'pasar manis', loaded_model, scale_ayam, forecast_days)
-    ayam_pw = make_forecast(df_ayam,'pasar wage', loaded_model, scale_ayam, forecast_days)
 
-    # loading..
-    st.write("Hampir selesai....")
+    forecast_cache, model_key = load_forecast_cache(MODEL_PATH, FORECAST_ENGINE)
 
-    # merge data hasil forecast
-    ayam_gab = merge_forecast_data(ayam_pm, ayam_pw)
-    bawang_gab = merge_forecast_data(bawang_pm, bawang_pw)
-
-    # Export data forecast untuk visualisasi
-    try:
-        ayam_gab.to_excel(f"{data_config.BASE_PATH}/data_daging_ayam.xlsx")
-        bawang_gab.to_excel(f"{data_config.BASE_PATH}/data_bawang_merah.xlsx")
-    except FileNotFoundError:
-        print("Error: Jalur direktori tidak ditemukan."
-              "Periksa kembali BASE_PATH atau lokasi penyimpanan.")
-    except PermissionError:
-        print("Error: Tidak memiliki izin untuk menulis ke file."
-              "Tutup file jika sedang terbuka atau periksa izin direktori.")
-    except IOError as e:
-        print(f"Error I/O terjadi: {e}")
+    # Semua seri di katalog dihitung di background; job dengan horizon,
+    # versi data, versi model dan pilihan ekspor yang sama dipakai bersama.
+    # Model dimuat (cached), publish dan ekspor Excel berjalan di dalam job
+    # sehingga semuanya tercatat di rincian waktu
+    quantiles = model_config.FORECAST_QUANTILES if show_intervals else None
+    key = (int(forecast_days), data_version(), model_key, quantiles, export_excel)
+    manager = load_job_manager()
+    job = request_job(
+        manager, key, forecast_job,
+        lambda: load_lstm_model(MODEL_PATH, FORECAST_ENGINE),
+        forecast_days, forecast_cache, model_key, quantiles,
+        publish=lambda combined: publish(combined, model_key, forecast_days, export_excel),
+        timing=lambda: timing_run('forecast_job', show_timing, horizon=int(forecast_days),
+                                  engine=FORECAST_ENGINE)
+    )
+    if job is None or not render_job_status(manager, job):
+        return
 
     # done
     st.write("Sukses")
-    st.write("Silahkan klik tombol bawang merah atau "
-             "daging ayam di sebelah kiri untuk melihat hasil")
+    st.write("Silahkan klik halaman komoditas di sebelah kiri untuk melihat hasil")
+
+    # Rincian waktu dari job (tidak ada jika hasil dibaca dari disk)
+    if show_timing and job.timing is not None:
+        from visual.timing_panel import render_timing_panel
+        render_timing_panel(job.timing)
 
 if __name__ == "__main__":
     forecast_days = st.number_input("Masukkan angka sesuai kebutuhan Anda"
                              " untuk meramalkan jumlah hari", value=0)
+    show_intervals = st.checkbox("Hitung interval prediksi (P10/P50/P90)", value=False)
+    export_excel = st.checkbox("Ekspor juga ke Excel (.xlsx)", value=False)
+    show_timing = st.sidebar.checkbox("Catat waktu per tahap",
+                                      value=metrics_config.METRICS_ENABLED)
     if forecast_days > 0:
         main()
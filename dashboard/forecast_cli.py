@@ -0,0 +1,72 @@
+'''
+Peramalan batch tanpa Streamlit untuk semua seri di katalog (komoditas x pasar)
+
+Contoh (dijalankan dari root repo, misalnya lewat cron):
+    python dashboard/forecast_cli.py --days 93 --workers 4 --chunk-size 64
+    python dashboard/forecast_cli.py --days 93 --append bawang_merah harga_baru.csv
+'''
+import argparse
+import time
+import pandas as pd
+import config.model as model_config
+from config.commodity import COMMODITIES
+from prepare_data.preprocess import ingest_new_rows
+from forecast_data.pipeline import run_catalog
+from instrument.timing import timing_run
+
+def run(forecast_days, workers=1, engine=model_config.FORECAST_ENGINE, export_excel=False,
+        commodity_keys=None, chunk_size=64, quantiles=None):
+    '''
+    Method ini meramalkan semua seri di katalog (atau hanya commodity_keys)
+    per chunk, lalu menulis artifact per komoditas dan artifact konsolidasi
+    '''
+    return run_catalog(forecast_days, workers, engine, chunk_size, commodity_keys, export_excel,
+                       quantiles=quantiles)
+
+def main():
+    '''
+    Fungsi utama command line
+    '''
+    parser = argparse.ArgumentParser(description="Peramalan harga komoditas tanpa Streamlit")
+    parser.add_argument("--days", type=int, default=93, help="Jumlah hari yang diramalkan")
+    parser.add_argument("--workers", type=int, default=1, help="Jumlah proses worker")
+    parser.add_argument("--engine", choices=["numpy", "tflite", "keras", "service", "ensemble"], default=model_config.FORECAST_ENGINE)
+    parser.add_argument("--chunk-size", type=int, default=64,
+                        help="Jumlah seri per batch rollout (membatasi memori per worker)")
+    parser.add_argument("--intervals", action="store_true",
+                        help="Tambahkan interval prediksi (kuantil FORECAST_QUANTILES)")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Catat waktu per tahap ke METRICS_LOG (termasuk tahap di worker)")
+    parser.add_argument("--excel", action="store_true", help="Ekspor juga ke Excel (.xlsx)")
+    parser.add_argument("--append", nargs=2, action="append", metavar=("KOMODITAS", "CSV"),
+                        help="Tambahkan data harian baru (CSV: tanggal + kolom pasar) "
+                             "lalu ramalkan ulang hanya komoditas tersebut")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+
+    # Data baru ditambahkan di tempat, hanya komoditas yang berubah diramalkan ulang
+    commodity_keys = None
+    if args.append:
+        commodity_keys = []
+        for commodity_key, csv_path in args.append:
+            if commodity_key not in COMMODITIES:
+                parser.error(f"Komoditas {commodity_key} tidak ada di registry")
+            commodity = COMMODITIES[commodity_key]
+            df_scaled, _ = ingest_new_rows(
+                commodity['history'], pd.read_csv(csv_path), commodity['markets']
+            )
+            print(f"{commodity_key}: {len(df_scaled)} baris data historis setelah update")
+            commodity_keys.append(commodity_key)
+
+    quantiles = model_config.FORECAST_QUANTILES if args.intervals else None
+    with timing_run('forecast_cli', args.metrics or None, horizon=args.days,
+                    engine=args.engine, workers=args.workers):
+        counts = run(args.days, args.workers, args.engine, args.excel, commodity_keys,
+                     args.chunk_size, quantiles)
+    n_series = sum(counts.values())
+    print(f"{n_series} seri diramalkan {args.days} hari dalam "
+          f"{time.perf_counter() - start:.2f} detik")
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,3 @@
+from . import cache
 from . import forecast
 from . import merge
\ No newline at end of file
@@ -0,0 +1,240 @@
+'''
+Penyimpanan hasil peramalan dalam format kolom NumPy
+
+Satu artifact adalah direktori berisi versi-versi (v-*) dan file CURRENT
+yang menunjuk versi aktif. Setiap penulis menyusun versinya sendiri lalu
+mengganti CURRENT dengan os.replace, sehingga pembaca selalu menemukan
+versi yang lengkap dan penulis bersamaan tidak saling menghapus.
+'''
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+
+FORMAT_VERSION = 1
+METADATA_FILE = "metadata.json"
+CURRENT_FILE = "CURRENT"
+# Versi lama dihapus setelah tidak aktif selama ini (detik), supaya pembaca
+# yang baru saja membaca CURRENT lama dan penulis yang belum mengganti
+# CURRENT tidak kehilangan direktorinya
+STALE_VERSION_SECONDS = 60
+
+# dtype file .npy untuk setiap jenis kolom
+KIND_DTYPES = {
+    'datetime': np.dtype('datetime64[ns]'),
+    'float': np.dtype(np.float64),
+    'category': np.dtype(np.int32),
+}
+
+def column_kind(values):
+    '''Jenis kolom artifact: datetime, float, atau category'''
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return 'datetime'
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return 'float'
+    return 'category'
+
+class ArtifactWriter:
+    '''
+    Menulis artifact secara bertahap. Setiap append hanya menambahkan byte
+    ke file kolom di direktori sementara, sehingga DataFrame lengkap tidak
+    pernah ditahan di memori. Artifact baru terlihat setelah close().
+    '''
+    def __init__(self, path, model_hash=None, horizon=None):
+        self.path = path
+        self.model_hash = model_hash
+        self.horizon = horizon
+        self.columns = None
+        self.rows = 0
+        # kode kategori per kolom, berlaku untuk semua append
+        self._codes = {}
+
+        # Direktori sementara unik per penulis
+        os.makedirs(path, exist_ok=True)
+        self.tmp_path = tempfile.mkdtemp(prefix='v-', suffix='.tmp', dir=path)
+
+    def _part_path(self, column):
+        return os.path.join(self.tmp_path, f"{column['file']}.part")
+
+    def _encode(self, column, values):
+        if column['kind'] == 'datetime':
+            return values.to_numpy(dtype='datetime64[ns]')
+        if column['kind'] == 'float':
+            return values.to_numpy(dtype=np.float64)
+
+        # Kategori baru mendapat kode berikutnya, kode lama tidak berubah
+        values = values.astype('category')
+        codes = self._codes[column['name']]
+        mapping = np.array(
+            [codes.setdefault(str(category), len(codes)) for category in values.cat.categories],
+            dtype=np.int32
+        )
+        local_codes = values.cat.codes.to_numpy()
+        if not len(mapping):
+            return np.full(len(local_codes), -1, dtype=np.int32)
+        return np.where(local_codes < 0, -1, mapping[local_codes]).astype(np.int32)
+
+    def append(self, df):
+        '''Menambahkan baris df ke artifact'''
+        if self.columns is None:
+            self.columns = []
+            for i, column in enumerate(df.columns):
+                kind = column_kind(df[column])
+                if kind == 'category':
+                    self._codes[column] = {}
+                self.columns.append({'name': column, 'kind': kind, 'file': f"{i}.npy"})
+        elif list(df.columns) != [column['name'] for column in self.columns]:
+            raise ValueError("Kolom DataFrame berbeda dengan append sebelumnya")
+
+        for column in self.columns:
+            array = self._encode(column, df[column['name']])
+            with open(self._part_path(column), 'ab') as file:
+                file.write(np.ascontiguousarray(array).tobytes())
+        self.rows += len(df)
+
+    def close(self):
+        '''
+        Method ini menyusun file .npy dari file kolom, menulis metadata,
+        lalu mengganti artifact lama dengan yang baru.
+        '''
+        columns = []
+        for column in self.columns or []:
+            dtype = KIND_DTYPES[column['kind']]
+            with open(os.path.join(self.tmp_path, column['file']), 'wb') as file:
+                np.lib.format.write_array_header_1_0(file, {
+                    'descr': np.lib.format.dtype_to_descr(dtype),
+                    'fortran_order': False,
+                    'shape': (self.rows,),
+                })
+                with open(self._part_path(column), 'rb') as part:
+                    shutil.copyfileobj(part, file)
+            os.remove(self._part_path(column))
+
+            categories = None
+            if column['kind'] == 'category':
+                categories = list(self._codes[column['name']])
+            columns.append({**column, 'categories': categories})
+
+        metadata = {
+            'format_version': FORMAT_VERSION,
+            'model_hash': self.model_hash,
+            'horizon': None if self.horizon is None else int(self.horizon),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'rows': self.rows,
+            'columns': columns,
+        }
+        with open(os.path.join(self.tmp_path, METADATA_FILE), 'w', encoding='utf-8') as file:
+            json.dump(metadata, file, indent=1)
+
+        version = os.path.basename(self.tmp_path)[:-len('.tmp')]
+        os.rename(self.tmp_path, os.path.join(self.path, version))
+        publish_version(self.path, version)
+
+        return metadata
+
+    def discard(self):
+        '''Membuang direktori sementara tanpa menerbitkan artifact'''
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+
+def publish_version(path, version):
+    '''
+    Method ini mengarahkan CURRENT ke versi baru secara atomik, lalu
+    menghapus versi lain yang sudah lama tidak aktif dan file layout lama
+    (artifact yang ditulis langsung di path).
+    '''
+    previous_path = current_version_path(path)
+    fd, pointer_path = tempfile.mkstemp(prefix=f"{CURRENT_FILE}-", suffix='.tmp', dir=path)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            file.write(version)
+        os.replace(pointer_path, os.path.join(path, CURRENT_FILE))
+    finally:
+        if os.path.exists(pointer_path):
+            os.remove(pointer_path)
+
+    # Waktu modifikasi versi sebelumnya menandai kapan versi itu tidak aktif
+    if previous_path != path:
+        try:
+            os.utime(previous_path)
+        except FileNotFoundError:
+            pass
+
+    stale_before = time.time() - STALE_VERSION_SECONDS
+    for entry in os.listdir(path):
+        entry_path = os.path.join(path, entry)
+        if entry in (CURRENT_FILE, version):
+            continue
+        if entry.endswith('.npy') or entry == METADATA_FILE:
+            os.remove(entry_path)
+        elif entry.startswith('v-') and not entry.endswith('.tmp'):
+            try:
+                if os.path.getmtime(entry_path) < stale_before:
+                    shutil.rmtree(entry_path, ignore_errors=True)
+            except FileNotFoundError:
+                pass
+
+def write_artifact(df, path, model_hash=None, horizon=None):
+    '''
+    Method ini menyimpan DataFrame hasil merge ke direktori artifact.
+    Setiap kolom disimpan sebagai file .npy bertipe (datetime64, float64,
+    atau kode kategori) dan metadata disimpan di metadata.json.
+    Penulisan dilakukan di direktori sementara lalu di-rename agar
+    pembaca tidak pernah melihat artifact setengah jadi.
+    '''
+    writer = ArtifactWriter(path, model_hash, horizon)
+    try:
+        writer.append(df)
+        return writer.close()
+    except BaseException:
+        writer.discard()
+        raise
+
+def current_version_path(path):
+    '''Direktori versi yang ditunjuk CURRENT (layout lama: path itu sendiri)'''
+    try:
+        with open(os.path.join(path, CURRENT_FILE), encoding='utf-8') as file:
+            return os.path.join(path, file.read().strip())
+    except FileNotFoundError:
+        return path
+
+def read_metadata(path):
+    '''Membaca metadata artifact'''
+    with open(os.path.join(current_version_path(path), METADATA_FILE), encoding='utf-8') as file:
+        return json.load(file)
+
+def artifact_version(path):
+    '''Versi artifact untuk kunci cache, None jika artifact belum ada'''
+    try:
+        metadata = read_metadata(path)
+    except FileNotFoundError:
+        return None
+
+    return f"{metadata['created_at']}:{metadata['model_hash']}"
+
+def read_artifact(path, mmap=True):
+    '''
+    Method ini membaca artifact menjadi DataFrame. Kolom float dibaca
+    dengan memory-map sehingga tidak ada parsing teks sama sekali.
+    '''
+    # Metadata dan kolom dibaca dari versi yang sama
+    path = current_version_path(path)
+    metadata = read_metadata(path)
+    mmap_mode = 'r' if mmap else None
+
+    data = {}
+    for column in metadata['columns']:
+        array = np.load(os.path.join(path, column['file']), mmap_mode=mmap_mode)
+        if column['kind'] == 'category':
+            data[column['name']] = pd.Categorical.from_codes(
+                np.asarray(array), categories=column['categories']
+            )
+        elif column['kind'] == 'datetime':
+            data[column['name']] = pd.DatetimeIndex(np.asarray(array))
+        else:
+            data[column['name']] = array
+
+    return pd.DataFrame(data, copy=False), metadata
@@ -0,0 +1,142 @@
+'''
+Backtesting rolling-origin untuk mengukur akurasi peramalan
+'''
+import time
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from prepare_data.window import windows_at
+from .forecast import rollout
+
+def forecast_origins(n_rows, horizon, n_origins, look_back=1):
+    '''
+    Menentukan titik awal peramalan yang tersebar merata di data historis,
+    setiap titik masih memiliki data aktual sepanjang horizon
+    '''
+    last_origin = n_rows - horizon
+    if last_origin < look_back:
+        raise ValueError(f"Data terlalu pendek untuk horizon {horizon} hari")
+
+    return np.unique(np.linspace(look_back, last_origin, n_origins).astype(int))
+
+def backtest(series, loaded_model, horizon=93, n_origins=200, look_back=1):
+    '''
+    Method ini menjalankan backtest rolling-origin. series berisi list tuple
+    (komoditas, df, column_name, scale) dengan df yang sudah dinormalisasi.
+    Semua origin dari semua seri diramalkan bersama dalam satu batch,
+    hasilnya berupa MAE/MAPE/RMSE per horizon, komoditas dan pasar.
+    '''
+    windows = []
+    actuals = []
+    counts = []
+    for _, df, column_name, scale in series:
+        values = df[column_name].values.astype(np.float32)
+        origins = forecast_origins(len(values), horizon, n_origins, look_back)
+
+        windows.append(windows_at(values, origins, look_back)[:, :, 0])
+        actual = sliding_window_view(values, horizon)[origins]
+        actuals.append(scale.inverse_transform(actual.reshape(-1, 1)).reshape(actual.shape))
+        counts.append(len(origins))
+
+    forecasted_values = rollout(loaded_model, np.concatenate(windows), horizon)
+
+    results = []
+    offset = 0
+    for (commodity, _, column_name, scale), actual, count in zip(series, actuals, counts):
+        predicted = forecasted_values[offset:offset + count]
+        predicted = scale.inverse_transform(predicted.reshape(-1, 1)).reshape(predicted.shape)
+        offset += count
+
+        errors = predicted - actual
+        results.append(pd.DataFrame({
+            'Komoditas': commodity,
+            'Pasar': column_name,
+            'Horizon': np.arange(1, horizon + 1),
+            'MAE': np.abs(errors).mean(axis=0),
+            'MAPE': (np.abs(errors) / np.abs(actual)).mean(axis=0) * 100,
+            'RMSE': np.sqrt((errors ** 2).mean(axis=0)),
+            'Origins': count,
+        }))
+
+    return pd.concat(results, ignore_index=True)
+
+def compare_models(series, models, horizon=93, n_origins=200, look_back=1):
+    '''
+    Method ini membandingkan akurasi beberapa model (misalnya rekursif dan
+    direct multi-horizon) pada origin yang sama. models berupa dict
+    {nama: model}, hasilnya rata-rata MAE/MAPE/RMSE semua seri per model
+    dan horizon, beserta waktu peramalan per model (detik).
+    '''
+    results, seconds = [], {}
+    for name, model in models.items():
+        start = time.perf_counter()
+        result = backtest(series, model, horizon, n_origins, look_back)
+        seconds[name] = time.perf_counter() - start
+        result.insert(0, 'Model', name)
+        results.append(result)
+
+    comparison = pd.concat(results, ignore_index=True).groupby(
+        ['Model', 'Horizon'], sort=False
+    )[['MAE', 'MAPE', 'RMSE']].mean()
+
+    return comparison, seconds
+
+def summarize(result):
+    '''Ringkasan rata-rata metrik seluruh horizon per komoditas dan pasar'''
+    return result.groupby(['Komoditas', 'Pasar'])[['MAE', 'MAPE', 'RMSE']].mean()
+
+if __name__ == "__main__":
+    # python -m forecast_data.backtest dijalankan dari root repo
+    # dengan PYTHONPATH=dashboard
+    import argparse
+    import config.model as model_config
+    from config.commodity import COMMODITIES
+    from prepare_data.preprocess import load_scaled_data
+    from forecast_data.engine import load_forecast_model
+    from forecast_data.pipeline import catalog_series
+
+    parser = argparse.ArgumentParser(description="Backtest rolling-origin model LSTM")
+    parser.add_argument("--horizon", type=int, default=93)
+    parser.add_argument("--origins", type=int, default=200)
+    parser.add_argument("--output", help="Simpan metrik per horizon ke file CSV")
+    parser.add_argument("--direct-model", metavar="H5",
+                        help="Bandingkan dengan model direct multi-horizon (python -m "
+                             "training.train --horizon H)")
+    args = parser.parse_args()
+
+    model = load_forecast_model('numpy', model_config.MODEL_FILE_NAME)
+
+    # Semua seri di katalog, data setiap komoditas dimuat sekali
+    scaled = {}
+    backtest_series = []
+    for commodity_key, market in catalog_series():
+        commodity = COMMODITIES[commodity_key]
+        if commodity_key not in scaled:
+            scaled[commodity_key] = load_scaled_data(commodity['history'], commodity['markets'])
+        df_scaled, scalers = scaled[commodity_key]
+        backtest_series.append((commodity['title'], df_scaled, market, scalers[market]))
+
+    if args.direct_model:
+        comparison, seconds = compare_models(backtest_series, {
+            'rekursif': model,
+            'direct': load_forecast_model('numpy', args.direct_model),
+        }, args.horizon, args.origins)
+        # Rata-rata metrik sampai horizon tertentu
+        for name, model_seconds in seconds.items():
+            metrics = comparison.loc[name]
+            print(f"{name}: {model_seconds:.2f} detik")
+            for horizon in sorted({1, 7, 30, args.horizon} & set(metrics.index)):
+                row = metrics.loc[:horizon].mean()
+                print(f"  horizon 1-{horizon}: MAE {row['MAE']:.1f} MAPE {row['MAPE']:.2f}% "
+                      f"RMSE {row['RMSE']:.1f}")
+        if args.output:
+            comparison.to_csv(args.output)
+        raise SystemExit(0)
+
+    start = time.perf_counter()
+    backtest_result = backtest(backtest_series, model, args.horizon, args.origins)
+    print(summarize(backtest_result))
+    print(f"Selesai dalam {time.perf_counter() - start:.2f} detik")
+
+    if args.output:
+        backtest_result.to_csv(args.output, index=False)
@@ -0,0 +1,106 @@
+'''
+Cache hasil peramalan berdasarkan prefix horizon
+'''
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+def file_fingerprint(path):
+    '''Menghitung hash isi file, dipakai sebagai fingerprint model'''
+    digest = hashlib.sha1()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+def series_fingerprint(last_window):
+    '''
+    Menghitung hash window terakhir sebuah seri. Hasil rollout hanya
+    ditentukan oleh window ini, jadi data historis yang lebih lama
+    tidak perlu di-hash ulang ketika ada data harian baru.
+    '''
+    window = np.ascontiguousarray(last_window, dtype=np.float32)
+
+    return hashlib.sha1(f"{window.shape}".encode() + window.tobytes()).hexdigest()
+
+class ForecastCache:
+    '''
+    Menyimpan hasil peramalan terpanjang untuk setiap kunci
+    (fingerprint model, fingerprint seri, kolom). Horizon yang lebih pendek
+    dilayani dengan slicing, horizon yang lebih panjang dilanjutkan dari
+    nilai terakhir yang sudah dihitung. Entri yang paling lama tidak dipakai
+    dibuang jika total ukuran melebihi max_bytes.
+    '''
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        '''Mengambil hasil peramalan terpanjang untuk kunci, atau None'''
+        with self._lock:
+            path = self._entries.get(key)
+            if path is not None:
+                self._entries.move_to_end(key)
+
+            return path
+
+    def put(self, key, path):
+        '''Menyimpan hasil peramalan jika lebih panjang dari yang sudah ada'''
+        with self._lock:
+            old_path = self._entries.get(key)
+            if old_path is not None:
+                if len(old_path) >= len(path):
+                    self._entries.move_to_end(key)
+                    return
+                self._nbytes -= old_path.nbytes
+                del self._entries[key]
+
+            path = np.array(path, dtype=np.float32)
+            path.setflags(write=False)
+            self._entries[key] = path
+            self._nbytes += path.nbytes
+
+            # Buang entri yang paling lama tidak dipakai
+            while self._nbytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+
+    def rollout(self, rollout_fn, keys, last_windows, forecast_steps):
+        '''
+        Method ini menjalankan peramalan hanya untuk langkah yang belum
+        ada di cache. Seri yang perlu dilanjutkan tetap dijalankan
+        bersama dalam satu batch, mulai dari window terakhir yang
+        tersusun dari data historis dan hasil peramalan di cache.
+        '''
+        paths = [self.get(key) for key in keys]
+        missing = [
+            i for i, path in enumerate(paths)
+            if path is None or len(path) < forecast_steps
+        ]
+
+        if missing:
+            start_windows = []
+            for i in missing:
+                window = np.asarray(last_windows[i], dtype=np.float32)
+                if paths[i] is not None:
+                    window = np.concatenate([window, paths[i]])[-len(window):]
+                start_windows.append(window)
+            done_steps = [0 if paths[i] is None else len(paths[i]) for i in missing]
+            extension = rollout_fn(start_windows, forecast_steps - min(done_steps))
+
+            for row, i in enumerate(missing):
+                # Langkah ekstra dari batch tetap disimpan, gratis untuk request berikutnya
+                new_path = extension[row]
+                if paths[i] is not None:
+                    new_path = np.concatenate([paths[i], new_path])
+                paths[i] = new_path
+                self.put(keys[i], new_path)
+
+        return np.stack([path[:forecast_steps] for path in paths])
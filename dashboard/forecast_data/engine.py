@@ -0,0 +1,53 @@
+'''
+Memuat model peramalan sesuai engine yang dipilih
+'''
+import config.model as model_config
+from .cache import file_fingerprint
+from .numpy_lstm import load_numpy_model, npz_path_for
+from .service_client import ServiceModel
+
+def load_forecast_model(engine=model_config.FORECAST_ENGINE,
+                        model_path=model_config.MODEL_FILE_NAME):
+    '''
+    Method ini memuat model untuk make_forecast. Engine "numpy" tidak
+    membutuhkan TensorFlow, engine "tflite" memakai interpreter TFLite
+    (file .tflite dibuat dari .h5 saat pertama kali), engine "service"
+    meneruskan peramalan ke forecast service lokal, engine "ensemble"
+    memuat semua model di ENSEMBLE_MODEL_DIR (engine NumPy), engine
+    "keras" memuat file .h5 apa adanya.
+    '''
+    if engine == "numpy":
+        # Setiap file model punya file .npz sendiri, jadi rollback ke .h5
+        # lama tidak pernah memakai bobot model yang lebih baru
+        return load_numpy_model(npz_path_for(model_path), model_path)
+
+    if engine == "tflite":
+        from .tflite_engine import load_tflite_model
+        return load_tflite_model(model_path, model_config.TFLITE_QUANTIZATION)
+
+    if engine == "ensemble":
+        from .ensemble import load_ensemble
+        return load_ensemble(model_config.ENSEMBLE_MODEL_DIR)
+
+    if engine == "service":
+        return ServiceModel(model_config.FORECAST_SERVICE_URL)
+
+    # TensorFlow hanya dimuat jika engine keras dipilih
+    import tensorflow as tf
+    from keras.models import load_model
+
+    # set tensorflow to run only on cpu
+    tf.config.set_visible_devices([], 'GPU')
+    return load_model(model_path)
+
+def model_fingerprint(engine=model_config.FORECAST_ENGINE,
+                      model_path=model_config.MODEL_FILE_NAME):
+    '''
+    Method ini mengembalikan versi model untuk key job, cache dan artefak.
+    Engine ikut di dalam versi karena hasil tiap engine bisa berbeda, dan
+    engine "ensemble" memakai versi dari semua file anggotanya.
+    '''
+    if engine == "ensemble":
+        from .ensemble import ensemble_fingerprint
+        return f"{engine}:{ensemble_fingerprint(model_config.ENSEMBLE_MODEL_DIR)}"
+    return f"{engine}:{file_fingerprint(model_path)}"
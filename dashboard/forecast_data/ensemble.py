@@ -0,0 +1,155 @@
+'''
+Ensemble beberapa model LSTM (engine NumPy) yang dijalankan bersamaan
+
+Bobot semua anggota ditumpuk pada dimensi pertama, sehingga satu forward
+pass menghitung semua anggota dengan batched matmul. Rollout anggota
+berjalan serentak (lockstep): jumlah langkah Python tetap sama seperti
+satu model, berapa pun jumlah anggotanya.
+'''
+import glob
+import hashlib
+import os
+import numpy as np
+from instrument.timing import span
+from prepare_data.window import shift_window
+from .cache import file_fingerprint
+from .numpy_lstm import ACTIVATIONS, load_numpy_model, npz_path_for
+
+class EnsembleLSTM:
+    '''
+    Ensemble dari beberapa NumpyLSTM dengan arsitektur yang sama.
+    predict mengembalikan rata-rata prediksi satu langkah semua anggota
+    (interface sama dengan model Keras), predict_members hasil per anggota.
+    '''
+    def __init__(self, members, fingerprint=None):
+        if not members:
+            raise ValueError("Ensemble membutuhkan minimal satu model")
+        layers = members[0].layers
+        for member in members[1:]:
+            if member.layers != layers or any(
+                    weights.keys() != first.keys()
+                    or any(weights[name].shape != first[name].shape for name in first)
+                    for weights, first in zip(member.weights, members[0].weights)):
+                raise ValueError("Semua anggota ensemble harus punya arsitektur yang sama")
+
+        self.layers = layers
+        self.n_members = len(members)
+        self.fingerprint = fingerprint
+        self.weights = [
+            {name: np.stack([member.weights[i][name] for member in members]) for name in first}
+            for i, first in enumerate(members[0].weights)
+        ]
+
+    @property
+    def horizon(self):
+        '''Jumlah output per anggota (lebih dari 1 untuk model direct)'''
+        return int(self.weights[-1]['bias'].shape[-1])
+
+    @staticmethod
+    def _lstm(x, layer, weights):
+        kernel = weights['kernel']
+        recurrent_kernel = weights['recurrent_kernel']
+        activation = ACTIVATIONS[layer['activation']]
+        recurrent_activation = ACTIVATIONS[layer['recurrent_activation']]
+
+        units = recurrent_kernel.shape[1]
+
+        # Proyeksi input semua batch dan timestep: satu matmul per anggota
+        n_members, batch, timesteps, features = x.shape
+        x_proj = (x.reshape(n_members, batch * timesteps, features) @ kernel
+                  + weights['bias'][:, None]).reshape(n_members, batch, timesteps, -1)
+        outputs = []
+        for t in range(x.shape[2]):
+            # State awal nol (model stateless), sama seperti NumpyLSTM
+            if t == 0:
+                z = x_proj[:, :, t]
+            else:
+                z = x_proj[:, :, t] + h @ recurrent_kernel
+            i = recurrent_activation(z[..., :units])
+            g = i * activation(z[..., 2 * units:3 * units])
+            c = g if t == 0 else recurrent_activation(z[..., units:2 * units]) * c + g
+            o = recurrent_activation(z[..., 3 * units:])
+            h = o * activation(c)
+            outputs.append(h)
+
+        if layer['return_sequences']:
+            return np.stack(outputs, axis=2)
+
+        return h
+
+    def predict_members(self, x):
+        '''
+        Forward pass semua anggota sekaligus, x berbentuk
+        (anggota, batch, timesteps, features) atau (batch, timesteps,
+        features) untuk input yang sama di semua anggota
+        '''
+        output = np.asarray(x, dtype=np.float32)
+        if output.ndim == 3:
+            output = np.broadcast_to(output, (self.n_members,) + output.shape)
+        for layer, weights in zip(self.layers, self.weights):
+            if layer['class_name'] == 'LSTM':
+                output = self._lstm(output, layer, weights)
+            else:
+                output = ACTIVATIONS[layer['activation']](
+                    output @ weights['kernel'] + weights['bias'][:, None]
+                )
+
+        return output
+
+    def predict(self, x, verbose=0):
+        '''Rata-rata prediksi satu langkah semua anggota'''
+        return self.predict_members(x).mean(axis=0)
+
+def rollout_members(ensemble, last_windows, forecast_steps=93, progress=None):
+    '''
+    Method ini menjalankan peramalan rekursif semua anggota dan semua seri
+    dalam satu batch; setiap anggota memakai prediksinya sendiri sebagai
+    input langkah berikutnya. Hasil berbentuk (anggota, n_seri, langkah).
+    Anggota direct multi-horizon maju per blok horizon, seperti rollout.
+    '''
+    window = np.array(last_windows, dtype=np.float32).reshape(len(last_windows), -1)
+    n_series, look_back = window.shape
+    windows = np.repeat(window[None], ensemble.n_members, axis=0)
+    paths = np.empty((ensemble.n_members, n_series, forecast_steps), dtype=np.float32)
+    block = ensemble.horizon
+
+    for start in range(0, forecast_steps, block):
+        with span('model.predict'):
+            next_pred = ensemble.predict_members(windows[:, :, None, :])
+        end = min(start + block, forecast_steps)
+        next_pred = next_pred[..., :end - start]
+        paths[:, :, start:end] = next_pred
+
+        # Geser window setiap anggota
+        shift_window(windows, next_pred)
+
+        if progress is not None:
+            progress(end, forecast_steps)
+
+    return paths
+
+def ensemble_model_files(model_dir):
+    '''File model (.h5) anggota ensemble di direktori, terurut'''
+    return sorted(glob.glob(os.path.join(model_dir, "*.h5")))
+
+def ensemble_fingerprint(model_dir):
+    '''Versi ensemble dihitung dari semua file anggotanya'''
+    return hashlib.sha1(
+        ''.join(file_fingerprint(path) for path in ensemble_model_files(model_dir)).encode()
+    ).hexdigest()
+
+def load_ensemble(model_dir):
+    '''
+    Memuat semua model .h5 di model_dir sebagai satu ensemble. File .npz
+    setiap anggota dibuat otomatis di samping file .h5-nya.
+    '''
+    model_files = ensemble_model_files(model_dir)
+    if not model_files:
+        raise FileNotFoundError(f"Tidak ada file model .h5 di {model_dir}")
+
+    members = [
+        load_numpy_model(npz_path_for(path), path) for path in model_files
+    ]
+    fingerprint = ensemble_fingerprint(model_dir)
+
+    return EnsembleLSTM(members, fingerprint)
@@ -3,71 +3,217 @@ Make forecast with LSTM Model
 '''
 import pandas as pd
 import numpy as np
+from instrument.timing import span
+from prepare_data.window import last_window, shift_window
+from .cache import series_fingerprint
+from .ensemble import rollout_members
+from .interval import bootstrap_noise, horizon_residuals, path_quantiles
 
-def make_forecast(df, column_name, loaded_model, scale, forecast_steps=93):
-    look_back=1
-    historical_data = df[column_name].values
-    
-    # Pre-reshape historical data once
-    historical_data_reshaped = historical_data.reshape(-1, 1)
-
-    x_forecast = []
-    y_forecast = []
-
-    for i in range(len(historical_data_reshaped) - look_back):
-        x_forecast.append(historical_data_reshaped[i:(i + look_back), 0])
-        y_forecast.append(historical_data_reshaped[i + look_back, 0])
-
-    x_forecast = np.array(x_forecast)
-    y_forecast = np.array(y_forecast)
-
-    x_forecast = x_forecast.reshape(x_forecast.shape[0], 1, x_forecast.shape[1])
-    
-    # Batch predict instead of predicting forecast_steps separately
-    pred_forecast = loaded_model.predict(x_forecast[-forecast_steps:], verbose=0)
-
-    # Iteratively forecast future values
-    forecasted_values = []
-    last_input = x_forecast[-1:, :, :]  # Keep the last sequence
-    
-    for i in range(forecast_steps):
-        # Predict the next value
-        next_pred = loaded_model.predict(last_input, verbose=0)
-        forecasted_values.append(next_pred[0])
-        
-        # Update input for next iteration
-        last_input = next_pred.reshape(1, 1, look_back)
+def model_horizon(loaded_model):
+    '''
+    Jumlah langkah ke depan yang dihasilkan satu forward pass: 1 untuk
+    model rekursif, H untuk model direct multi-horizon (Dense(H))
+    '''
+    horizon = getattr(loaded_model, 'horizon', None)
+    if horizon is None:
+        # Model Keras
+        output_shape = getattr(loaded_model, 'output_shape', None)
+        horizon = output_shape[-1] if output_shape else 1
+
+    return int(horizon)
+
+def rollout(loaded_model, last_windows, forecast_steps=93, noise=None, progress=None):
+    '''
+    Method ini digunakan untuk peramalan rekursif banyak seri sekaligus.
+    last_windows berbentuk (n_seri, look_back) dengan nilai terbaru di
+    kolom terakhir. Semua seri ditumpuk pada dimensi batch, sehingga
+    setiap langkah cukup satu kali panggilan predict untuk seluruh seri.
+    Model yang punya method rollout sendiri (misalnya ServiceModel)
+    menjalankan seluruh horizon sendiri. Jika noise (n_seri, forecast_steps)
+    diberikan, noise ditambahkan ke setiap prediksi sebelum dipakai
+    sebagai input langkah berikutnya (sample path). progress(langkah, total)
+    dipanggil setelah setiap langkah; exception dari progress menghentikan
+    rollout (dipakai untuk membatalkan job). Model direct multi-horizon
+    menghasilkan H langkah per predict, sehingga horizon sampai H cukup
+    satu panggilan dan horizon lebih panjang dilanjutkan per blok H.
+    '''
+    if hasattr(loaded_model, 'rollout'):
+        if noise is not None:
+            raise ValueError("Sample path membutuhkan engine numpy atau keras")
+        forecasted_values = loaded_model.rollout(last_windows, forecast_steps)
+        if progress is not None:
+            progress(forecast_steps, forecast_steps)
+        return forecasted_values
+
+    window = np.array(last_windows, dtype=np.float32).reshape(len(last_windows), -1)
+    n_series, look_back = window.shape
+    block = model_horizon(loaded_model)
+    forecasted_values = np.empty((n_series, forecast_steps), dtype=np.float32)
+
+    for start in range(0, forecast_steps, block):
+        # Predict the next value(s) for every series at once
+        with span('model.predict'):
+            next_pred = loaded_model.predict(window.reshape(n_series, 1, look_back), verbose=0)
+        end = min(start + block, forecast_steps)
+        next_pred = next_pred[:, :end - start]
+        if noise is not None:
+            next_pred = next_pred + noise[:, start:end]
+        forecasted_values[:, start:end] = next_pred
+
+        # Geser window dan isi dengan hasil prediksi
+        shift_window(window, next_pred)
+
+        if progress is not None:
+            progress(end, forecast_steps)
+
+    return forecasted_values
+
+def combine_forecast(df, column_name, scale, forecasted_values, quantile_values=None,
+                     spread_values=None):
+    '''
+    Method ini digunakan untuk menggabungkan data historis dan hasil
+    peramalan yang sudah dikembalikan ke skala harga asli. quantile_values
+    ({label: array}) ditambahkan sebagai kolom di samping Forecast.
+    spread_values (simpangan baku ensemble, skala 0-1) menjadi kolom Spread.
+    '''
+    historical_data = df[column_name]
 
     last_date = df.index[-1]  # Ambil tanggal terakhir dalam data
     future_index = pd.date_range(
         start=last_date + pd.DateOffset(days=1),
-        periods=forecast_steps,
+        periods=len(forecasted_values),
         freq='D'
     )
-    
-    # Flatten and reshape once
-    forecasted_values_flat = np.array(forecasted_values).flatten()
-    forecast_df = pd.DataFrame({
-        'Forecast': forecasted_values_flat
-        }, index=future_index)
 
     # Batch inverse transform
     forecasted_values_denormalized = scale.inverse_transform(
-        forecasted_values_flat.reshape(-1, 1)
+        np.asarray(forecasted_values).reshape(-1, 1)
     ).flatten()
 
     historical_data_denormalized = scale.inverse_transform(
-        historical_data_reshaped
+        historical_data.values.reshape(-1, 1)
     ).flatten()
 
     historical_data_denorm_df = pd.DataFrame({
         'Historical Data': historical_data_denormalized
     }, index=historical_data.index)
 
-    forecasted_values_denorm_pm_df = pd.DataFrame({
+    forecasted_values_denorm_df = pd.DataFrame({
         'Forecast': forecasted_values_denormalized
-    }, index=forecast_df.index)
+    }, index=future_index)
+    for label, values in (quantile_values or {}).items():
+        forecasted_values_denorm_df[label] = scale.inverse_transform(
+            np.asarray(values).reshape(-1, 1)
+        ).flatten()
+    if spread_values is not None:
+        # Selisih, bukan level: hanya faktor skala scaler yang dipakai
+        spread = np.asarray(spread_values).reshape(-1, 1)
+        forecasted_values_denorm_df['Spread'] = (
+            scale.inverse_transform(spread) - scale.inverse_transform(np.zeros_like(spread))
+        ).flatten()
 
-    combined_denorm_df = pd.concat([historical_data_denorm_df, forecasted_values_denorm_pm_df])
+    combined_denorm_df = pd.concat([historical_data_denorm_df, forecasted_values_denorm_df])
 
     return combined_denorm_df
+
+def forecast_quantiles(series, loaded_model, last_windows, forecast_steps, quantiles,
+                       n_samples=1000, seed=0, look_back=1, progress=None):
+    '''
+    Method ini menghitung kuantil hasil peramalan dengan bootstrap
+    residual: n_samples sample path untuk setiap seri dijalankan
+    sebagai satu rollout batch. Model direct multi-horizon memakai
+    residual per output, sehingga interval melebar sesuai error tiap horizon.
+    '''
+    horizon = model_horizon(loaded_model)
+    residuals = [
+        horizon_residuals(loaded_model, df[column_name].values, horizon, look_back)
+        for df, column_name, _ in series
+    ]
+    noise = bootstrap_noise(residuals, n_samples, forecast_steps, np.random.default_rng(seed))
+    paths = rollout(loaded_model, np.repeat(np.asarray(last_windows), n_samples, axis=0),
+                    forecast_steps, noise, progress)
+
+    return path_quantiles(paths, len(series), quantiles)
+
+def _phase_progress(progress, phase):
+    '''Callback rollout yang meneruskan (tahap, langkah, total) ke progress'''
+    if progress is None:
+        return None
+
+    return lambda done, total: progress(phase, done, total)
+
+def make_forecast_batch(series, loaded_model, forecast_steps=93, cache=None, model_key=None,
+                        look_back=1, quantiles=None, n_samples=1000, seed=0, progress=None):
+    '''
+    Method ini digunakan untuk meramalkan banyak seri sekaligus.
+    series berisi list tuple (df, column_name, scale) dan hasilnya
+    berupa list DataFrame dengan urutan yang sama. Jika cache
+    (ForecastCache) diberikan, langkah yang sudah pernah dihitung
+    untuk model_key yang sama tidak dihitung ulang. Jika quantiles
+    diberikan (misalnya (0.1, 0.5, 0.9)), kolom P10/P50/P90 dari
+    bootstrap residual ditambahkan di samping Forecast. progress
+    dipanggil dengan (tahap, langkah, total), tahap 'forecast' atau
+    'intervals'. Untuk ensemble (model dengan predict_members) Forecast
+    adalah rata-rata rollout semua anggota dan kolom Spread simpangan
+    bakunya. Hasil ensemble dan model direct multi-horizon tidak disimpan
+    di cache.
+    '''
+    # Hanya window terakhir yang dipakai untuk peramalan. Seri satu kolom
+    # selalu punya satu fitur; rollout juga univariat karena prediksi
+    # dimasukkan kembali sebagai satu-satunya input langkah berikutnya
+    last_windows = [
+        last_window(df[column_name].values, look_back)[:, 0]
+        for df, column_name, _ in series
+    ]
+
+    spread_values = None
+    with span('rollout'):
+        if hasattr(loaded_model, 'predict_members'):
+            member_paths = rollout_members(loaded_model, last_windows, forecast_steps,
+                                           _phase_progress(progress, 'forecast'))
+            forecasted_values = member_paths.mean(axis=0)
+            spread_values = member_paths.std(axis=0)
+        elif cache is None or model_horizon(loaded_model) > 1:
+            # Model direct memulai blok baru dari batas blok, bukan dari
+            # langkah terakhir yang ada di cache, jadi tidak memakai cache
+            forecasted_values = rollout(loaded_model, last_windows, forecast_steps,
+                                        progress=_phase_progress(progress, 'forecast'))
+        else:
+            keys = [
+                (model_key, model_horizon(loaded_model), series_fingerprint(window), column_name)
+                for window, (_, column_name, _) in zip(last_windows, series)
+            ]
+            forecasted_values = cache.rollout(
+                lambda values, steps: rollout(loaded_model, values, steps,
+                                              progress=_phase_progress(progress, 'forecast')),
+                keys, last_windows, forecast_steps
+            )
+
+    quantile_values = {}
+    if quantiles:
+        with span('intervals'):
+            quantile_values = forecast_quantiles(
+                series, loaded_model, last_windows, forecast_steps, quantiles, n_samples, seed,
+                look_back, _phase_progress(progress, 'intervals')
+            )
+
+    with span('inverse_transform'):
+        return [
+            combine_forecast(
+                df, column_name, scale, forecasted_values[i],
+                {label: values[i] for label, values in quantile_values.items()},
+                None if spread_values is None else spread_values[i]
+            )
+            for i, (df, column_name, scale) in enumerate(series)
+        ]
+
+def make_forecast(df, column_name, loaded_model, scale, forecast_steps=93,
+                  cache=None, model_key=None, look_back=1, quantiles=None, n_samples=1000, seed=0,
+                  progress=None):
+    '''
+    Method ini digunakan untuk meramalkan satu seri
+    '''
+    return make_forecast_batch(
+        [(df, column_name, scale)], loaded_model, forecast_steps, cache, model_key, look_back,
+        quantiles, n_samples, seed, progress
+    )[0]
@@ -0,0 +1,64 @@
+'''
+Interval prediksi dengan bootstrap residual per horizon
+
+Residual dihitung dari prediksi model pada seluruh data historis
+(skala 0-1): satu kolom untuk model rekursif, H kolom (satu per output)
+untuk model direct multi-horizon. Sample path dibuat dengan rollout
+biasa, tetapi setiap prediksi ditambah residual yang diambil acak
+sebelum dipakai sebagai input langkah berikutnya. Semua sample path
+seluruh seri dijalankan sebagai satu batch.
+'''
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from prepare_data.window import windows_at
+
+def quantile_label(quantile):
+    '''Nama kolom untuk kuantil, misalnya 0.1 -> P10'''
+    return f"P{round(quantile * 100):g}"
+
+def horizon_residuals(loaded_model, values, horizon=1, look_back=1):
+    '''
+    Method ini menghitung residual y - prediksi untuk seluruh window
+    historis yang masih punya data aktual sepanjang horizon, berbentuk
+    (n_window, horizon): kolom h adalah error output ke-h model. Cukup
+    satu kali panggilan predict.
+    '''
+    if not hasattr(loaded_model, 'predict'):
+        raise ValueError("Interval prediksi membutuhkan engine numpy atau keras")
+
+    values = np.asarray(values, dtype=np.float32)
+    if len(values) < look_back + horizon:
+        raise ValueError(f"Data minimal {look_back + horizon} baris untuk horizon {horizon}")
+
+    ends = np.arange(look_back, len(values) - horizon + 1)
+    x = windows_at(values, ends, look_back)
+    predicted = loaded_model.predict(x.reshape(len(x), 1, look_back), verbose=0)
+    actual = sliding_window_view(values, horizon)[ends]
+
+    return (actual - predicted[:, :horizon]).astype(np.float32)
+
+def bootstrap_noise(residuals, n_samples, forecast_steps, rng):
+    '''
+    Residual acak untuk setiap sample path, berbentuk
+    (n_seri * n_samples, forecast_steps) dengan urutan seri per seri.
+    Residual (n_window, H) diambil satu baris per blok H langkah, jadi
+    output ke-h setiap blok selalu mendapat error horizon ke-h.
+    '''
+    noise = []
+    for series_residuals in residuals:
+        n_windows, horizon = series_residuals.shape
+        n_blocks = -(-forecast_steps // horizon)
+        rows = rng.integers(0, n_windows, (n_samples, n_blocks))
+        noise.append(series_residuals[rows].reshape(n_samples, -1)[:, :forecast_steps])
+
+    return np.concatenate(noise)
+
+def path_quantiles(paths, n_series, quantiles):
+    '''
+    Kuantil per langkah dari sample path, hasilnya dict
+    {label: array (n_seri, forecast_steps)}
+    '''
+    paths = paths.reshape(n_series, -1, paths.shape[-1])
+    values = np.quantile(paths, quantiles, axis=1)
+
+    return {quantile_label(q): values[i] for i, q in enumerate(quantiles)}
@@ -0,0 +1,188 @@
+'''
+Job peramalan di background dengan deduplikasi, progress dan pembatalan
+
+Job diidentifikasi dengan key (misalnya horizon, versi data, versi model).
+Request dengan key yang sama selagi job masih berjalan atau sudah selesai
+mendapat job yang sama. Setiap peminta (misalnya sesi Streamlit) tercatat
+sebagai subscriber; job baru dibatalkan jika subscriber terakhir pergi.
+Hasil job yang selesai disimpan sebagai artifact di disk, sehingga proses
+baru tidak perlu menghitung ulang.
+'''
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from .artifact import read_artifact, write_artifact
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+class JobCancelled(Exception):
+    '''Dilempar di dalam job ketika pembatalan diminta'''
+
+class ForecastJob:
+    '''Status satu job; progress dan message diperbarui dari thread worker'''
+    def __init__(self, key):
+        self.key = key
+        self.status = PENDING
+        self.progress = 0.0
+        self.message = ''
+        self.result = None
+        self.error = None
+        self.timing = None
+        self.created_at = time.time()
+        self.subscribers = set()
+        self._cancel_event = threading.Event()
+
+    @property
+    def active(self):
+        '''True selama job belum selesai, gagal atau dibatalkan'''
+        return self.status in (PENDING, RUNNING)
+
+    def report(self, progress, message=''):
+        '''Memperbarui progress (0-1) lalu berhenti jika job dibatalkan'''
+        self.progress = min(max(progress, 0.0), 1.0)
+        self.message = message
+        self.check_cancelled()
+
+    @property
+    def cancel_requested(self):
+        '''True jika pembatalan sudah diminta'''
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        '''Meminta pembatalan, job berhenti di langkah berikutnya'''
+        self._cancel_event.set()
+
+    def check_cancelled(self):
+        '''Melempar JobCancelled jika pembatalan sudah diminta'''
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+def key_hash(key):
+    '''Nama direktori hasil untuk key job'''
+    return hashlib.sha1(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+
+class JobManager:
+    '''
+    Menjalankan job di thread pool. Hasil job berupa dict
+    {nama: DataFrame} yang disimpan sebagai artifact di result_dir;
+    hanya max_results hasil terbaru yang disimpan di memori dan disk.
+    '''
+    def __init__(self, result_dir, max_workers=1, max_results=16):
+        self.result_dir = result_dir
+        self.max_results = max_results
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix='forecast-job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        '''Job untuk key, None jika belum pernah dijalankan'''
+        with self._lock:
+            return self._jobs.get(key)
+
+    def submit(self, key, function, *args, publish=None, subscriber=None, timing=None):
+        '''
+        Method ini menjalankan function(job, *args) di background dan
+        mengembalikan job-nya. Jika job dengan key sama sedang berjalan
+        atau sudah selesai, job itu yang dikembalikan. publish(result)
+        dipanggil sekali setelah hasil tersedia (dihitung atau dibaca
+        dari disk). subscriber (misalnya id sesi) dicatat di job.
+        timing() membuat context manager (misalnya timing_run) yang
+        membungkus perhitungan dan publish; nilainya disimpan di job.timing.
+        '''
+        with self._lock:
+            job = self._jobs.get(key)
+            if (job is not None and job.status not in (FAILED, CANCELLED)
+                    and not (job.active and job.cancel_requested)):
+                if subscriber is not None:
+                    job.subscribers.add(subscriber)
+                return job
+
+            job = ForecastJob(key)
+            if subscriber is not None:
+                job.subscribers.add(subscriber)
+            self._jobs[key] = job
+            self._evict()
+
+        self._executor.submit(self._run, job, function, args, publish, timing)
+        return job
+
+    def detach(self, job, subscriber):
+        '''
+        Method ini melepas subscriber dari job. Job yang masih berjalan
+        baru dibatalkan jika tidak ada subscriber lain yang menunggunya.
+        '''
+        with self._lock:
+            job.subscribers.discard(subscriber)
+            if job.active and not job.subscribers:
+                job.cancel()
+
+    def _run(self, job, function, args, publish, timing):
+        try:
+            with self._lock:
+                job.check_cancelled()
+                job.status = RUNNING
+            with (timing() if timing is not None else nullcontext()) as run:
+                result = self._load(job.key)
+                if result is None:
+                    result = function(job, *args)
+                    self._save(job.key, result)
+                if publish is not None:
+                    publish(result)
+            with self._lock:
+                job.timing = run
+                job.result = result
+                job.progress = 1.0
+                job.status = DONE
+        except JobCancelled:
+            with self._lock:
+                job.status = CANCELLED
+        except Exception as error:  # pylint: disable=broad-except
+            with self._lock:
+                job.error = error
+                job.status = FAILED
+
+    def _evict(self):
+        # Hanya job yang sudah tidak aktif yang dibuang dari memori
+        finished = sorted(
+            (job for job in self._jobs.values() if not job.active),
+            key=lambda job: job.created_at
+        )
+        for job in finished[:max(len(self._jobs) - self.max_results, 0)]:
+            del self._jobs[job.key]
+
+    def _load(self, key):
+        '''Membaca hasil job dari disk, None jika belum ada'''
+        path = os.path.join(self.result_dir, key_hash(key))
+        if not os.path.exists(os.path.join(path, 'key.json')):
+            return None
+
+        with open(os.path.join(path, 'key.json'), encoding='utf-8') as file:
+            names = json.load(file)['names']
+
+        return {name: read_artifact(os.path.join(path, f"{name}.forecast"))[0] for name in names}
+
+    def _save(self, key, result):
+        '''Menyimpan hasil job ke disk lalu membuang hasil lama'''
+        path = os.path.join(self.result_dir, key_hash(key))
+        os.makedirs(path, exist_ok=True)
+        for name, df in result.items():
+            write_artifact(df, os.path.join(path, f"{name}.forecast"))
+        # key.json ditulis terakhir sebagai penanda hasil lengkap
+        with open(os.path.join(path, 'key.json'), 'w', encoding='utf-8') as file:
+            json.dump({'key': key, 'names': list(result)}, file, indent=1)
+
+        entries = sorted(
+            (os.path.join(self.result_dir, entry) for entry in os.listdir(self.result_dir)),
+            key=os.path.getmtime
+        )
+        for old_path in entries[:max(len(entries) - self.max_results, 0)]:
+            shutil.rmtree(old_path, ignore_errors=True)
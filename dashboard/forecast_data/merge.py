@@ -1,34 +1,61 @@
 '''
 Save Data Prediction
 '''
+import numpy as np
 import pandas as pd
 
+KETERANGAN_CATEGORIES = ['Historical Data', 'Forecast']
+
 def merge_forecast_data(forecast_pm, forecast_pw):
     '''
     Method ini digunakan untuk menggabungkan data hasil peramalan
+    Pasar Manis dan Pasar Wage (lihat merge_market_forecasts)
     '''
-    # DataFrames are already passed in, no need to convert
-    data_df_pm = forecast_pm if isinstance(forecast_pm, pd.DataFrame) else pd.DataFrame(forecast_pm)
-    data_df_pw = forecast_pw if isinstance(forecast_pw, pd.DataFrame) else pd.DataFrame(forecast_pw)
-
-    # Add "Pasar Manis" column by filling values from "Historical Data" and "Forecast"
-    data_df_pm['Pasar Manis'] = data_df_pm['Historical Data'].combine_first(data_df_pm['Forecast'])
-
-    # Add "Pasar Wage" column by filling values from "Historical Data" and "Forecast"
-    data_df_pw['Pasar Wage'] = data_df_pw['Historical Data'].combine_first(data_df_pw['Forecast'])
+    return merge_market_forecasts([forecast_pm, forecast_pw], ['Pasar Manis', 'Pasar Wage'])
 
-    # Create "Keterangan" column using vectorized operation
-    data_df_pm['Keterangan'] = data_df_pm['Historical Data'].notna().map({True: 'Historical Data', False: 'Forecast'})
+def merge_market_forecasts(forecasts, labels):
+    '''
+    Method ini menggabungkan hasil peramalan sejumlah pasar dari satu
+    komoditas menjadi satu tabel, satu kolom per pasar. Pasar dengan index
+    tanggal berbeda di-reindex ke index pasar pertama (tanggal yang tidak
+    ada terisi NaN).
+    Kolom kuantil (P10, P50, ...) menjadi kolom "<pasar> P10" dan seterusnya.
+    Semua nilai diisi ke satu array yang dialokasikan sekali; DataFrame
+    input tidak diubah. Keterangan disimpan sebagai categorical.
+    '''
+    first = forecasts[0]
+    forecasts = [
+        forecast if forecast.index.equals(first.index) else forecast.reindex(first.index)
+        for forecast in forecasts
+    ]
+    extra_columns = [
+        [column for column in forecast.columns if column not in ('Historical Data', 'Forecast')]
+        for forecast in forecasts
+    ]
+    columns = list(labels) + [
+        f"{label} {column}" for label, extras in zip(labels, extra_columns) for column in extras
+    ]
 
-    # Merge DataFrames based on index
-    final_df = pd.DataFrame({
-        'Date': data_df_pm.index,
-        'Pasar Manis': data_df_pm['Pasar Manis'],
-        'Pasar Wage': data_df_pw['Pasar Wage'],
-        'Keterangan': data_df_pm['Keterangan']
-    })
+    # Satu blok float (baris x kolom), diisi per kolom tanpa salinan antara
+    values = np.empty((len(first), len(columns)))
+    history_mask = None
+    for j, forecast in enumerate(forecasts):
+        history = forecast['Historical Data'].to_numpy(dtype=np.float64)
+        mask = ~np.isnan(history)
+        np.copyto(values[:, j], forecast['Forecast'].to_numpy(dtype=np.float64))
+        np.copyto(values[:, j], history, where=mask)
+        if history_mask is None:
+            history_mask = mask
+    j = len(forecasts)
+    for forecast, extras in zip(forecasts, extra_columns):
+        for column in extras:
+            values[:, j] = forecast[column].to_numpy(dtype=np.float64)
+            j += 1
 
-    # Reset index
-    final_df = final_df.reset_index(drop=True)
+    final_df = pd.DataFrame(values, columns=columns, copy=False)
+    final_df.insert(0, 'Date', first.index.to_numpy())
+    final_df['Keterangan'] = pd.Categorical.from_codes(
+        (~history_mask).astype(np.int8), categories=KETERANGAN_CATEGORIES
+    )
 
     return final_df
@@ -0,0 +1,161 @@
+'''
+Inference LSTM murni NumPy dari bobot model Keras (.h5)
+'''
+import json
+import os
+import tempfile
+import numpy as np
+
+ACTIVATIONS = {
+    'tanh': np.tanh,
+    'sigmoid': lambda x: 1.0 / (1.0 + np.exp(-x)),
+    'hard_sigmoid': lambda x: np.clip(0.2 * x + 0.5, 0.0, 1.0),
+    'relu': lambda x: np.maximum(x, 0.0),
+    'linear': lambda x: x,
+}
+
+def export_weights(model_path, npz_path):
+    '''
+    Method ini digunakan untuk membaca bobot dari file .h5 Keras
+    dan menyimpannya ke file .npz yang ringkas, tanpa TensorFlow
+    '''
+    import h5py
+
+    layers = []
+    arrays = {}
+    with h5py.File(model_path, 'r') as h5_file:
+        model_config = json.loads(h5_file.attrs['model_config'])
+        weights = h5_file['model_weights']
+
+        for layer in model_config['config']['layers']:
+            class_name = layer['class_name']
+            config = layer['config']
+            if class_name == 'InputLayer':
+                continue
+            if class_name not in ('LSTM', 'Dense'):
+                raise ValueError(f"Layer {class_name} tidak didukung oleh engine NumPy")
+
+            name = config['name']
+            group = weights[name]
+            for weight_name in group.attrs['weight_names']:
+                weight_name = weight_name.decode() if isinstance(weight_name, bytes) else weight_name
+                key = f"{len(layers)}/{weight_name.split('/')[-1].split(':')[0]}"
+                arrays[key] = np.asarray(group[weight_name], dtype=np.float32)
+
+            layers.append({
+                'class_name': class_name,
+                'activation': config['activation'],
+                'recurrent_activation': config.get('recurrent_activation'),
+                'return_sequences': config.get('return_sequences', False),
+            })
+
+    # Ditulis ke file sementara lalu di-rename: worker lain yang memuat
+    # model bersamaan tidak pernah membaca file setengah jadi
+    fd, tmp_path = tempfile.mkstemp(suffix='.npz.tmp', dir=os.path.dirname(os.path.abspath(npz_path)))
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            np.savez(file, layers=np.array(json.dumps(layers)), **arrays)
+        os.replace(tmp_path, npz_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+class NumpyLSTM:
+    '''
+    Model Sequential (LSTM/Dense) yang dijalankan dengan NumPy.
+    Interface predict sama dengan model Keras sehingga bisa langsung
+    dipakai oleh make_forecast.
+    '''
+    def __init__(self, layers, weights):
+        self.layers = layers
+        self.weights = weights
+
+    @classmethod
+    def from_npz(cls, npz_path):
+        '''Memuat model dari file .npz hasil export_weights'''
+        with np.load(npz_path) as data:
+            layers = json.loads(str(data['layers']))
+            weights = [
+                {key.split('/', 1)[1]: data[key] for key in data.files
+                 if key.startswith(f"{i}/")}
+                for i in range(len(layers))
+            ]
+
+        return cls(layers, weights)
+
+    @property
+    def horizon(self):
+        '''Jumlah output model (lebih dari 1 untuk model direct multi-horizon)'''
+        return int(self.weights[-1]['bias'].shape[-1])
+
+    @staticmethod
+    def _lstm(x, layer, weights):
+        kernel = weights['kernel']
+        recurrent_kernel = weights['recurrent_kernel']
+        bias = weights['bias']
+        activation = ACTIVATIONS[layer['activation']]
+        recurrent_activation = ACTIVATIONS[layer['recurrent_activation']]
+
+        units = recurrent_kernel.shape[0]
+
+        # Proyeksi input untuk semua timestep dihitung sekaligus
+        x_proj = x @ kernel + bias
+        outputs = []
+        for t in range(x.shape[1]):
+            # State awal nol (model stateless), langkah pertama tidak
+            # perlu perkalian recurrent_kernel
+            if t == 0:
+                z = x_proj[:, t]
+            else:
+                z = x_proj[:, t] + h @ recurrent_kernel
+            i = recurrent_activation(z[:, :units])
+            g = i * activation(z[:, 2 * units:3 * units])
+            c = g if t == 0 else recurrent_activation(z[:, units:2 * units]) * c + g
+            o = recurrent_activation(z[:, 3 * units:])
+            h = o * activation(c)
+            outputs.append(h)
+
+        if layer['return_sequences']:
+            return np.stack(outputs, axis=1)
+
+        return h
+
+    def predict(self, x, verbose=0):
+        '''Menjalankan forward pass, x berbentuk (batch, timesteps, features)'''
+        output = np.asarray(x, dtype=np.float32)
+        for layer, weights in zip(self.layers, self.weights):
+            if layer['class_name'] == 'LSTM':
+                output = self._lstm(output, layer, weights)
+            else:
+                output = ACTIVATIONS[layer['activation']](output @ weights['kernel'] + weights['bias'])
+
+        return output
+
+def npz_path_for(model_path):
+    '''Lokasi file .npz untuk file model, selalu di samping file .h5-nya'''
+    return f"{os.path.splitext(model_path)[0]}.npz"
+
+def load_numpy_model(npz_path, model_path):
+    '''
+    Memuat engine NumPy, file .npz dibuat otomatis dari .h5
+    jika belum ada atau lebih lama dari file .h5
+    '''
+    if (not os.path.exists(npz_path)
+            or os.path.getmtime(npz_path) < os.path.getmtime(model_path)):
+        export_weights(model_path, npz_path)
+
+    return NumpyLSTM.from_npz(npz_path)
+
+def check_parity(keras_model, numpy_model, x, atol=1e-5):
+    '''
+    Membandingkan output engine lain (NumPy, TFLite) dengan model Keras,
+    mengembalikan selisih absolut maksimum
+    '''
+    x = np.asarray(x, dtype=np.float32)
+    expected = keras_model.predict(x, verbose=0)
+    actual = numpy_model.predict(x)
+    max_diff = float(np.max(np.abs(expected - actual)))
+    if max_diff > atol:
+        raise AssertionError(f"Selisih engine {max_diff:.2e} melebihi toleransi {atol:.0e}")
+
+    return max_diff
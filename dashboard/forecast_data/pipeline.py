@@ -0,0 +1,300 @@
+'''
+Peramalan semua seri di katalog (komoditas x pasar) secara bertahap
+
+Seri dibagi rata ke semua worker dalam chunk berukuran maksimal
+chunk_size. Setiap chunk dijalankan sebagai satu rollout batch di proses
+worker. Begitu semua pasar satu komoditas selesai, hasilnya digabung,
+ditulis ke artifact per komoditas dan ditambahkan ke artifact
+konsolidasi, sehingga memori yang dipakai dibatasi oleh ukuran chunk,
+bukan jumlah seri di katalog.
+'''
+import hashlib
+import math
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import config.data as data_config
+import config.model as model_config
+from instrument.timing import current_run, span, timing_run
+from config.commodity import COMMODITIES, MARKETS
+from prepare_data.preprocess import content_hash, load_scaled_data
+from .artifact import ArtifactWriter, write_artifact
+from .engine import load_forecast_model, model_fingerprint
+from .forecast import make_forecast_batch
+from .merge import merge_market_forecasts
+
+# Model dimuat sekali per proses worker; waktu muatnya (epoch, detik)
+# dilaporkan bersama hasil chunk pertama
+_worker_model = None
+_worker_model_load = None
+
+def catalog_series(commodity_keys=None):
+    '''Daftar seri (komoditas, pasar) di katalog, atau hanya commodity_keys'''
+    return [
+        (commodity_key, market)
+        for commodity_key in (commodity_keys or COMMODITIES)
+        for market in COMMODITIES[commodity_key]['markets']
+    ]
+
+def chunk_series(series, chunk_size=64, workers=1):
+    '''
+    Membagi seri menjadi chunk berurutan berisi maksimal
+    min(chunk_size, ceil(n_seri / workers)) seri, sehingga setiap worker
+    mendapat bagian. Pasar dari satu komoditas bisa terbagi ke beberapa
+    chunk dan digabung kembali oleh run_catalog.
+    '''
+    size = max(1, min(chunk_size, math.ceil(len(series) / max(workers, 1))))
+
+    return [series[i:i + size] for i in range(0, len(series), size)]
+
+def forecast_series(chunk, loaded_model, forecast_days, cache=None, model_key=None,
+                    quantiles=None, progress=None):
+    '''
+    Method ini meramalkan satu chunk seri dalam satu rollout batch dan
+    mengembalikan dict {(komoditas, pasar): DataFrame hasil peramalan}.
+    quantiles menambahkan kolom interval prediksi, progress diteruskan ke
+    make_forecast_batch.
+    '''
+    scaled = {}
+    batch = []
+    with span('load_data'):
+        for commodity_key, market in chunk:
+            if commodity_key not in scaled:
+                commodity = COMMODITIES[commodity_key]
+                scaled[commodity_key] = load_scaled_data(commodity['history'], commodity['markets'])
+            df_scaled, scalers = scaled[commodity_key]
+            batch.append((df_scaled, market, scalers[market]))
+
+    results = make_forecast_batch(
+        batch, loaded_model, forecast_days, cache, model_key,
+        quantiles=quantiles, n_samples=model_config.FORECAST_SAMPLES, progress=progress
+    )
+
+    return dict(zip(chunk, results))
+
+def merge_commodities(forecasts):
+    '''
+    Menggabungkan hasil forecast_series menjadi dict {komoditas: DataFrame
+    gabungan semua pasar}, urutan pasar mengikuti katalog
+    '''
+    by_commodity = {}
+    for (commodity_key, market), result in forecasts.items():
+        by_commodity.setdefault(commodity_key, {})[market] = result
+
+    with span('merge'):
+        return {
+            commodity_key: merge_market_forecasts(
+                [market_forecasts[market] for market in COMMODITIES[commodity_key]['markets']
+                 if market in market_forecasts],
+                [MARKETS[market]['label'] for market in COMMODITIES[commodity_key]['markets']
+                 if market in market_forecasts]
+            )
+            for commodity_key, market_forecasts in by_commodity.items()
+        }
+
+def forecast_chunk(chunk, loaded_model, forecast_days, cache=None, model_key=None,
+                   quantiles=None, progress=None):
+    '''
+    Method ini meramalkan satu chunk seri (forecast_series) dan
+    mengembalikan dict {komoditas: DataFrame gabungan semua pasar}
+    '''
+    return merge_commodities(forecast_series(
+        chunk, loaded_model, forecast_days, cache, model_key, quantiles, progress
+    ))
+
+def data_version(commodity_keys=None):
+    '''Versi data historis: hash gabungan isi semua file di katalog'''
+    digest = hashlib.sha1()
+    for commodity_key in (commodity_keys or COMMODITIES):
+        path = COMMODITIES[commodity_key]['history']
+        digest.update(f"{commodity_key}:{content_hash(path)};".encode())
+
+    return digest.hexdigest()[:16]
+
+def export_excel_files(combined):
+    '''
+    Menulis hasil per komoditas ke file Excel. Error penulisan hanya
+    dicetak agar hasil yang sudah dipublish tetap bisa dipakai.
+    '''
+    try:
+        for commodity_key, commodity_df in combined.items():
+            with span('excel_export'):
+                commodity_df.to_excel(COMMODITIES[commodity_key]['excel'])
+    except FileNotFoundError:
+        print("Error: Jalur direktori tidak ditemukan."
+              "Periksa kembali BASE_PATH atau lokasi penyimpanan.")
+    except PermissionError:
+        print("Error: Tidak memiliki izin untuk menulis ke file."
+              "Tutup file jika sedang terbuka atau periksa izin direktori.")
+    except IOError as e:
+        print(f"Error I/O terjadi: {e}")
+
+def publish(combined, model_key=None, forecast_days=None, export_excel=False):
+    '''
+    Menulis hasil per komoditas ke artifact yang dibaca halaman dashboard,
+    dan ke file Excel jika export_excel
+    '''
+    for commodity_key, commodity_df in combined.items():
+        with span('export'):
+            write_artifact(commodity_df, COMMODITIES[commodity_key]['forecast'],
+                           model_key, forecast_days)
+    if export_excel:
+        export_excel_files(combined)
+
+def forecast_job(job, load_model, forecast_days, cache=None, model_key=None, quantiles=None):
+    '''
+    Job background (JobManager): memuat model dengan load_model() lalu
+    meramalkan semua seri di katalog sebagai satu batch dan melaporkan
+    progress setiap langkah rollout
+    '''
+    with span('model_load'):
+        loaded_model = load_model()
+
+    series = catalog_series()
+    # Porsi progress per tahap, sample path interval jauh lebih berat
+    phases = {'forecast': (0.0, 0.2), 'intervals': (0.2, 0.8)} if quantiles else \
+        {'forecast': (0.0, 1.0)}
+    labels = {'forecast': 'peramalan', 'intervals': 'interval prediksi'}
+
+    def progress(phase, done, total):
+        start, size = phases[phase]
+        job.report(start + size * done / total,
+                   f"{len(series)} seri, {labels[phase]} langkah {done}/{total}")
+
+    return forecast_chunk(series, loaded_model, forecast_days, cache, model_key,
+                          quantiles, progress)
+
+def init_worker(engine):
+    '''Initializer process pool, memuat model satu kali per worker'''
+    global _worker_model, _worker_model_load
+    epoch, start = time.time(), time.perf_counter()
+    _worker_model = load_forecast_model(engine)
+    _worker_model_load = (epoch, time.perf_counter() - start)
+
+def forecast_chunk_in_worker(chunk, forecast_days, quantiles=None, record_timing=False):
+    '''
+    forecast_series dengan model milik proses worker. Jika record_timing,
+    span di worker dikembalikan bersama hasil sebagai (epoch, spans)
+    agar bisa digabung ke run di proses utama.
+    '''
+    global _worker_model_load
+    if not record_timing:
+        return forecast_series(chunk, _worker_model, forecast_days, quantiles=quantiles), None
+
+    with timing_run('forecast_worker', True, log_path=None) as run:
+        if _worker_model_load is not None:
+            epoch, seconds = _worker_model_load
+            run.spans.append(('model_load', epoch - run.epoch, seconds, 0))
+            _worker_model_load = None
+        result = forecast_series(chunk, _worker_model, forecast_days, quantiles=quantiles)
+
+    return result, (run.epoch, run.spans)
+
+def iter_chunk_results(chunks, forecast_days, workers=1, engine=model_config.FORECAST_ENGINE,
+                       quantiles=None, record_timing=False):
+    '''
+    Menjalankan chunk di process pool dan mengembalikan (hasil, timing)
+    begitu selesai. Chunk yang berjalan bersamaan dibatasi 2 x workers agar
+    hasil yang belum diproses tidak menumpuk di memori. Dengan satu worker
+    semua berjalan di proses ini dan span langsung tercatat di run aktif.
+    '''
+    if workers <= 1:
+        with span('model_load'):
+            init_worker(engine)
+        for chunk in chunks:
+            yield forecast_chunk_in_worker(chunk, forecast_days, quantiles)
+        return
+
+    pending = set()
+    chunks = iter(chunks)
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(engine,)) as pool:
+        for chunk in chunks:
+            pending.add(pool.submit(forecast_chunk_in_worker, chunk, forecast_days, quantiles,
+                                    record_timing))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+def market_labels(commodity_key, combined):
+    '''Label pasar yang ada di tabel gabungan satu komoditas'''
+    return [
+        MARKETS[market]['label'] for market in COMMODITIES[commodity_key]['markets']
+        if MARKETS[market]['label'] in combined
+    ]
+
+def to_long_format(commodity_key, combined):
+    '''
+    Tabel gabungan satu komoditas ke format panjang
+    (Date, Komoditas, Pasar, Harga, Keterangan) untuk output konsolidasi.
+    Kolom interval prediksi tidak ikut, hanya tersedia di artifact per komoditas.
+    '''
+    long_df = combined.melt(
+        id_vars=['Date', 'Keterangan'], value_vars=market_labels(commodity_key, combined),
+        var_name='Pasar', value_name='Harga'
+    )
+    long_df.insert(1, 'Komoditas', COMMODITIES[commodity_key]['title'])
+
+    return long_df[['Date', 'Komoditas', 'Pasar', 'Harga', 'Keterangan']]
+
+def run_catalog(forecast_days, workers=1, engine=model_config.FORECAST_ENGINE, chunk_size=64,
+                commodity_keys=None, export_excel=False, output_path=data_config.FORECAST_ALL,
+                quantiles=None):
+    '''
+    Method ini meramalkan semua seri di katalog (atau hanya commodity_keys).
+    Artifact per komoditas ditulis begitu semua pasarnya selesai dan
+    hasilnya langsung ditambahkan ke artifact konsolidasi di output_path.
+    Mengembalikan jumlah seri per komoditas.
+    '''
+    model_key = model_fingerprint(engine, model_config.MODEL_FILE_NAME)
+    series = catalog_series(commodity_keys)
+    chunks = chunk_series(series, chunk_size, workers)
+    # Hasil pasar ditahan sampai semua pasar komoditasnya selesai
+    expected = Counter(commodity_key for commodity_key, _ in series)
+    pending = {}
+
+    run = current_run()
+    counts = {}
+    consolidated = None
+    try:
+        for result, timing in iter_chunk_results(chunks, forecast_days, workers, engine, quantiles,
+                                                 record_timing=run is not None):
+            # Span dari proses worker digabung ke run di proses ini
+            if run is not None and timing is not None:
+                epoch, spans = timing
+                run.add_spans(spans, epoch)
+            complete = {}
+            for (commodity_key, market), forecast in result.items():
+                pending.setdefault(commodity_key, {})[(commodity_key, market)] = forecast
+                if len(pending[commodity_key]) == expected[commodity_key]:
+                    complete.update(pending.pop(commodity_key))
+
+            for commodity_key, combined in merge_commodities(complete).items():
+                commodity = COMMODITIES[commodity_key]
+                with span('export'):
+                    write_artifact(combined, commodity['forecast'], model_key, forecast_days)
+                if export_excel:
+                    with span('excel_export'):
+                        combined.to_excel(commodity['excel'])
+
+                counts[commodity_key] = len(market_labels(commodity_key, combined))
+                if output_path:
+                    if consolidated is None:
+                        consolidated = ArtifactWriter(output_path, model_key, forecast_days)
+                    with span('export'):
+                        consolidated.append(to_long_format(commodity_key, combined))
+
+        if consolidated is not None:
+            with span('export'):
+                consolidated.close()
+    except BaseException:
+        # Direktori sementara artifact konsolidasi tidak ditinggalkan
+        if consolidated is not None:
+            consolidated.discard()
+        raise
+
+    return counts
@@ -0,0 +1,28 @@
+'''
+Client untuk forecast service lokal
+'''
+import json
+import urllib.request
+import numpy as np
+
+class ServiceModel:
+    '''
+    Model yang menjalankan rollout di forecast service. Dipakai sama
+    seperti model lain oleh make_forecast, seluruh horizon dikirim
+    dalam satu request.
+    '''
+    def __init__(self, url, timeout=60):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+
+    def rollout(self, last_windows, forecast_steps):
+        '''Meminta hasil peramalan rekursif untuk semua window sekaligus'''
+        windows = np.asarray(last_windows, dtype=np.float32).reshape(len(last_windows), -1)
+        body = json.dumps({'windows': windows.tolist(), 'steps': int(forecast_steps)}).encode()
+        request = urllib.request.Request(
+            f"{self.url}/forecast", data=body, headers={'Content-Type': 'application/json'}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            result = json.load(response)
+
+        return np.asarray(result['forecast'], dtype=np.float32)
@@ -0,0 +1,103 @@
+'''
+Inference LSTM dengan TensorFlow Lite (float16 atau int8 dynamic-range)
+'''
+import os
+import tempfile
+import threading
+import numpy as np
+
+QUANTIZATIONS = ('float16', 'int8')
+
+def tflite_path_for(model_path, quantization):
+    '''Lokasi file .tflite untuk model dan kuantisasi tertentu'''
+    return f"{os.path.splitext(model_path)[0]}.{quantization}.tflite"
+
+def convert_model(model_path, tflite_path, quantization='float16'):
+    '''
+    Method ini mengonversi model Keras (.h5) ke TFLite. Layer LSTM dibuat
+    ulang dengan unroll=True (bobot sama): model stateless satu timestep
+    menjadi operasi biasa tanpa state berukuran tetap, sehingga ukuran
+    batch bisa diubah saat inference.
+    '''
+    if quantization not in QUANTIZATIONS:
+        raise ValueError(f"Kuantisasi {quantization} tidak dikenal, pilih {QUANTIZATIONS}")
+
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(model_path, compile=False)
+    config = model.get_config()
+    for layer in config['layers']:
+        if layer['class_name'] == 'LSTM':
+            layer['config']['unroll'] = True
+    unrolled = model.__class__.from_config(config)
+    unrolled.set_weights(model.get_weights())
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(unrolled)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantization == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    tflite_model = converter.convert()
+
+    # File sementara unik per proses: worker yang mengonversi bersamaan
+    # tidak saling menimpa dan file gagal tidak tertinggal
+    fd, tmp_path = tempfile.mkstemp(suffix='.tflite.tmp',
+                                    dir=os.path.dirname(os.path.abspath(tflite_path)))
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(tflite_model)
+        os.replace(tmp_path, tflite_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+    return tflite_path
+
+def _interpreter_class():
+    '''tflite_runtime jika terpasang (tanpa TensorFlow), selain itu tf.lite'''
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        import tensorflow as tf
+        Interpreter = tf.lite.Interpreter
+
+    return Interpreter
+
+class TFLiteModel:
+    '''
+    Model TFLite dengan interface predict yang sama seperti model Keras.
+    Interpreter tidak thread-safe, jadi predict dijalankan bergantian.
+    '''
+    def __init__(self, tflite_path, num_threads=None):
+        self.interpreter = _interpreter_class()(model_path=tflite_path, num_threads=num_threads)
+        self._input_index = self.interpreter.get_input_details()[0]['index']
+        self._output_index = self.interpreter.get_output_details()[0]['index']
+        self._input_shape = None
+        self._lock = threading.Lock()
+        # Jumlah output (lebih dari 1 untuk model direct multi-horizon)
+        self.horizon = int(self.interpreter.get_output_details()[0]['shape'][-1])
+
+    def predict(self, x, verbose=0):
+        '''Menjalankan inference, x berbentuk (batch, 1, look_back)'''
+        x = np.ascontiguousarray(x, dtype=np.float32)
+        with self._lock:
+            # Tensor hanya dialokasikan ulang jika ukuran batch berubah
+            if x.shape != self._input_shape:
+                self.interpreter.resize_tensor_input(self._input_index, x.shape)
+                self.interpreter.allocate_tensors()
+                self._input_shape = x.shape
+            self.interpreter.set_tensor(self._input_index, x)
+            self.interpreter.invoke()
+
+            return self.interpreter.get_tensor(self._output_index).copy()
+
+def load_tflite_model(model_path, quantization='float16', num_threads=None):
+    '''
+    Memuat engine TFLite, file .tflite dibuat otomatis dari .h5
+    jika belum ada atau lebih lama dari file .h5
+    '''
+    tflite_path = tflite_path_for(model_path, quantization)
+    if (not os.path.exists(tflite_path)
+            or os.path.getmtime(tflite_path) < os.path.getmtime(model_path)):
+        convert_model(model_path, tflite_path, quantization)
+
+    return TFLiteModel(tflite_path, num_threads)
@@ -0,0 +1,205 @@
+'''
+Forecast service lokal dengan model yang selalu siap (warm) dan
+penggabungan request bersamaan menjadi satu batch
+
+Contoh (dijalankan dari root repo):
+    python dashboard/forecast_service.py --engine numpy
+Lalu set FORECAST_ENGINE = "service" di config/model.py
+'''
+import argparse
+import json
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import config.model as model_config
+from forecast_data.engine import load_forecast_model
+from forecast_data.forecast import rollout
+
+class MicroBatcher:
+    '''
+    Mengumpulkan request yang datang bersamaan selama max_wait detik
+    (maksimal max_batch seri), lalu menjalankan semuanya sebagai satu
+    rollout. Request dengan look_back berbeda dijalankan per kelompok.
+    '''
+    def __init__(self, model, max_batch=1024, max_wait=0.005,
+                 timeout=model_config.FORECAST_SERVICE_TIMEOUT):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, windows, steps):
+        '''Mengirim request dan menunggu hasilnya'''
+        request = {
+            'windows': np.asarray(windows, dtype=np.float32).reshape(len(windows), -1),
+            'steps': steps,
+            'done': threading.Event(),
+        }
+        self._queue.put(request)
+        if not request['done'].wait(self.timeout):
+            raise TimeoutError(f"Peramalan tidak selesai dalam {self.timeout} detik")
+        if 'error' in request:
+            raise request['error']
+
+        return request['result']
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        rows = len(batch[0]['windows'])
+        deadline = time.monotonic() + self.max_wait
+        while rows < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            batch.append(request)
+            rows += len(request['windows'])
+
+        return batch
+
+    def _run(self):
+        # Thread ini satu-satunya worker: error apa pun dikembalikan ke
+        # request yang bersangkutan, thread tidak boleh berhenti
+        while True:
+            batch = []
+            try:
+                batch = self._collect()
+
+                groups = {}
+                for request in batch:
+                    groups.setdefault(request['windows'].shape[1], []).append(request)
+
+                for requests in groups.values():
+                    self._run_group(requests)
+            except Exception as error:  # pylint: disable=broad-except
+                for request in batch:
+                    request.setdefault('error', error)
+                    request['done'].set()
+
+    def _run_group(self, requests):
+        try:
+            stacked = np.concatenate([request['windows'] for request in requests])
+            steps = max(request['steps'] for request in requests)
+            forecasted_values = rollout(self.model, stacked, steps)
+
+            offset = 0
+            for request in requests:
+                count = len(request['windows'])
+                request['result'] = forecasted_values[offset:offset + count, :request['steps']]
+                offset += count
+        except Exception as error:  # pylint: disable=broad-except
+            for request in requests:
+                request['error'] = error
+        finally:
+            for request in requests:
+                request['done'].set()
+
+def parse_windows(windows):
+    '''
+    Method ini mengubah field windows menjadi array 2D float32. Semua window
+    harus berupa list angka yang tidak kosong dan sama panjang.
+    '''
+    if not isinstance(windows, list) or not windows:
+        raise ValueError("windows harus list window yang tidak kosong")
+    if not all(isinstance(window, list) and window for window in windows):
+        raise ValueError("setiap window harus list angka yang tidak kosong")
+    if len({len(window) for window in windows}) > 1:
+        raise ValueError("semua window harus sama panjang")
+
+    array = np.asarray(windows, dtype=np.float32)
+    if array.ndim != 2:
+        raise ValueError("window harus berisi angka, bukan list bertingkat")
+
+    return array
+
+class ForecastServer(ThreadingHTTPServer):
+    '''HTTP server dengan antrean koneksi cukup besar untuk banyak sesi'''
+    request_queue_size = 128
+
+def make_handler(batcher):
+    '''Membuat handler HTTP yang meneruskan request ke batcher'''
+    class ForecastHandler(BaseHTTPRequestHandler):
+        '''POST /forecast {"windows": [[...]], "steps": N}, GET /health'''
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            if self.path == '/health':
+                self._send_json(200, {'status': 'ok'})
+            else:
+                self._send_json(404, {'error': 'not found'})
+
+        def do_POST(self):  # pylint: disable=invalid-name
+            if self.path != '/forecast':
+                self._send_json(404, {'error': 'not found'})
+                return
+
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length))
+                windows = parse_windows(payload['windows'])
+                steps = int(payload['steps'])
+                if not 0 < steps <= model_config.FORECAST_SERVICE_MAX_STEPS:
+                    raise ValueError(
+                        f"steps harus antara 1 dan {model_config.FORECAST_SERVICE_MAX_STEPS}"
+                    )
+            except KeyError as error:
+                self._send_json(400, {'error': f"field {error} wajib diisi"})
+                return
+            except (TypeError, ValueError) as error:
+                self._send_json(400, {'error': str(error)})
+                return
+
+            try:
+                result = batcher.submit(windows, steps)
+            except TimeoutError as error:
+                self._send_json(503, {'error': str(error)})
+                return
+            except Exception as error:  # pylint: disable=broad-except
+                self._send_json(500, {'error': str(error)})
+                return
+
+            self._send_json(200, {'forecast': result.tolist()})
+
+        def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+            pass
+
+    return ForecastHandler
+
+def serve(engine, host=model_config.FORECAST_SERVICE_HOST,
+          port=model_config.FORECAST_SERVICE_PORT, max_batch=1024, max_wait=0.005):
+    '''Menjalankan forecast service sampai dihentikan'''
+    batcher = MicroBatcher(load_forecast_model(engine), max_batch, max_wait)
+    server = ForecastServer((host, port), make_handler(batcher))
+    print(f"Forecast service berjalan di http://{host}:{port} (engine {engine})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Forecast service lokal")
+    parser.add_argument("--engine", choices=["numpy", "tflite", "keras"], default="numpy")
+    parser.add_argument("--host", default=model_config.FORECAST_SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=model_config.FORECAST_SERVICE_PORT)
+    parser.add_argument("--max-batch", type=int, default=1024)
+    parser.add_argument("--max-wait", type=float, default=0.005,
+                        help="Detik menunggu request lain sebelum batch dijalankan")
+    args = parser.parse_args()
+
+    serve(args.engine, args.host, args.port, args.max_batch, args.max_wait)
@@ -0,0 +1,152 @@
+'''
+Pencatatan waktu per tahap (span) untuk satu kali peramalan
+
+Span hanya dicatat di dalam timing_run yang aktif. Tanpa run aktif,
+span() mengembalikan context manager kosong yang sama setiap kali,
+sehingga instrumentasi hampir tanpa biaya saat dimatikan.
+'''
+import contextvars
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import config.metrics as metrics_config
+
+_current_run = contextvars.ContextVar('timing_run', default=None)
+
+class _NullSpan:
+    '''Span kosong saat pencatatan tidak aktif'''
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+NULL_SPAN = _NullSpan()
+
+class _Span:
+    '''Satu span aktif, dicatat ke run saat selesai'''
+    __slots__ = ('run', 'name', 'start')
+
+    def __init__(self, run, name):
+        self.run = run
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.run.depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter()
+        self.run.depth -= 1
+        self.run.spans.append(
+            (self.name, self.start - self.run.start, end - self.start, self.run.depth)
+        )
+        return False
+
+class TimingRun:
+    '''Kumpulan span dari satu kali peramalan'''
+    def __init__(self, name, **attrs):
+        self.name = name
+        self.attrs = attrs
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        # Waktu mulai epoch untuk menyelaraskan span dari proses lain
+        self.epoch = time.time()
+        self.start = time.perf_counter()
+        self.duration = None
+        self.depth = 0
+        # (nama, mulai relatif, durasi, kedalaman)
+        self.spans = []
+
+    def span(self, name):
+        '''Membuat span baru di run ini'''
+        return _Span(self, name)
+
+    def add_spans(self, spans, epoch):
+        '''
+        Method ini menambahkan span dari run lain (misalnya run di proses
+        worker yang dimulai pada waktu epoch) di bawah span yang sedang aktif
+        '''
+        offset = epoch - self.epoch
+        for name, start, duration, depth in spans:
+            self.spans.append((name, offset + start, duration, self.depth + depth))
+
+    def finish(self):
+        '''Menutup run dan menyimpan total durasi'''
+        self.duration = time.perf_counter() - self.start
+
+    def summary(self):
+        '''
+        Total waktu per nama span, diurutkan sesuai waktu mulai pertama.
+        Span yang dipanggil berkali-kali (misalnya model.predict) digabung.
+        '''
+        stages = {}
+        for name, start, duration, depth in sorted(self.spans, key=lambda span: span[1]):
+            stage = stages.setdefault(name, {
+                'stage': name, 'depth': depth, 'calls': 0, 'seconds': 0.0
+            })
+            stage['calls'] += 1
+            stage['seconds'] += duration
+
+        return list(stages.values())
+
+    def to_record(self):
+        '''Record JSON untuk log metrics'''
+        return {
+            'run': self.name,
+            'started_at': self.started_at,
+            'seconds': self.duration,
+            'attrs': self.attrs,
+            'stages': self.summary(),
+        }
+
+def current_run():
+    '''TimingRun yang sedang aktif, None jika pencatatan tidak aktif'''
+    return _current_run.get()
+
+def span(name):
+    '''
+    Context manager untuk mencatat satu tahap, misalnya
+    with span('merge'): ...
+    '''
+    run = _current_run.get()
+    if run is None:
+        return NULL_SPAN
+
+    return run.span(name)
+
+def append_record(log_path, record):
+    '''Menambahkan satu record ke file JSON lines'''
+    directory = os.path.dirname(log_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(log_path, 'a', encoding='utf-8') as file:
+        file.write(json.dumps(record) + '\n')
+
+@contextmanager
+def timing_run(name, enabled=None, log_path=metrics_config.METRICS_LOG, **attrs):
+    '''
+    Method ini mengaktifkan pencatatan span untuk blok di dalamnya.
+    Saat selesai, ringkasan run ditulis ke log_path (JSON lines).
+    Jika tidak aktif, yang dikembalikan None dan tidak ada yang dicatat.
+    '''
+    if enabled is None:
+        enabled = metrics_config.METRICS_ENABLED
+    if not enabled:
+        yield None
+        return
+
+    run = TimingRun(name, **attrs)
+    token = _current_run.set(run)
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
+        run.finish()
+        if log_path:
+            append_record(log_path, run.to_record())
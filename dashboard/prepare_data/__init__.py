@@ -1 +1,3 @@
-from . import hist_data
\ No newline at end of file
+from . import hist_data
+from . import preprocess
+from . import window
\ No newline at end of file
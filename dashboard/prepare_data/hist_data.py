@@ -1,6 +1,7 @@
 '''
 History data bawang merah dan daging ayam
 '''
+import os
 import pandas as pd
 
 def import_data(path):
@@ -12,3 +13,76 @@ def import_data(path):
     df = df.set_index('tanggal')
 
     return df
+
+def scale_data(df, columns=('pasar manis', 'pasar wage')):
+    '''
+    method untuk normalisasi data dengan satu scaler per kolom,
+    mengembalikan data hasil normalisasi dan dict scaler per kolom
+    '''
+    # sklearn hanya dimuat saat normalisasi benar-benar dibutuhkan
+    from sklearn.preprocessing import MinMaxScaler
+
+    df_scaled = df.copy()
+    scalers = {}
+    for column in columns:
+        scalers[column] = MinMaxScaler()
+        df_scaled[column] = scalers[column].fit_transform(df[[column]])
+
+    return df_scaled, scalers
+
+def last_date(path):
+    '''
+    method untuk membaca tanggal terakhir pada file CSV
+    tanpa membaca seluruh isi file
+    '''
+    with open(path, 'rb') as file:
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        file.seek(max(size - 4096, 0))
+        lines = file.read().decode('utf-8').strip().splitlines()
+
+    return pd.Timestamp(lines[-1].split(',', 1)[0])
+
+def validate_new_rows(new_rows, previous_date, columns=('pasar manis', 'pasar wage')):
+    '''
+    method untuk memeriksa data harian baru: tanggal harus berurutan
+    setiap hari tanpa celah, dimulai sehari setelah previous_date,
+    dan tidak boleh ada harga kosong
+    '''
+    df = new_rows.copy()
+    if 'tanggal' in df.columns:
+        df['tanggal'] = pd.to_datetime(df['tanggal'])
+        df = df.set_index('tanggal')
+    df.index = pd.DatetimeIndex(df.index, name='tanggal')
+    df = df[list(columns)].astype(float)
+
+    if df.empty:
+        raise ValueError("Tidak ada data baru")
+    if df.isna().any().any():
+        raise ValueError("Data baru berisi harga kosong")
+
+    expected = pd.date_range(previous_date + pd.DateOffset(days=1), periods=len(df), freq='D')
+    if not df.index.equals(expected):
+        raise ValueError(
+            f"Tanggal data baru harus harian berurutan mulai {expected[0].date()}, "
+            f"ditemukan {df.index[0].date()} s/d {df.index[-1].date()}"
+        )
+
+    return df
+
+def append_data(path, new_rows):
+    '''
+    method untuk menambahkan data harian baru ke akhir file CSV,
+    hanya baris baru yang ditulis
+    '''
+    # Urutan kolom mengikuti header file CSV
+    columns = list(pd.read_csv(path, nrows=0).columns.drop('tanggal'))
+    df = validate_new_rows(new_rows, last_date(path), columns)
+
+    with open(path, 'rb+') as file:
+        file.seek(-1, os.SEEK_END)
+        if file.read(1) != b'\n':
+            file.write(b'\n')
+    df.to_csv(path, mode='a', header=False, date_format='%Y-%m-%d')
+
+    return df
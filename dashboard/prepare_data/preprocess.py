@@ -0,0 +1,242 @@
+'''
+Cache hasil preprocessing (normalisasi) data historis di disk
+'''
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from io import BytesIO
+import numpy as np
+import pandas as pd
+import config.data as data_config
+from instrument.timing import span
+from .hist_data import append_data, import_data
+
+CACHE_VERSION = 1
+DEFAULT_COLUMNS = ('pasar manis', 'pasar wage')
+
+class SeriesScaler:
+    '''
+    Parameter normalisasi min-max satu seri. Interface transform dan
+    inverse_transform sama dengan MinMaxScaler (feature_range 0-1),
+    tetapi tidak perlu memuat sklearn.
+    '''
+    def __init__(self, data_min, data_max):
+        self.data_min_ = np.array([data_min], dtype=np.float64)
+        self.data_max_ = np.array([data_max], dtype=np.float64)
+        data_range = self.data_max_ - self.data_min_
+        self.scale_ = 1.0 / np.where(data_range == 0, 1.0, data_range)
+        self.min_ = -self.data_min_ * self.scale_
+
+    def transform(self, x):
+        '''Harga ke skala 0-1'''
+        return np.asarray(x, dtype=np.float64) * self.scale_ + self.min_
+
+    def inverse_transform(self, x):
+        '''Skala 0-1 ke harga'''
+        return (np.asarray(x, dtype=np.float64) - self.min_) / self.scale_
+
+    def to_dict(self):
+        '''Parameter scaler untuk disimpan di metadata'''
+        return {'data_min': float(self.data_min_[0]), 'data_max': float(self.data_max_[0])}
+
+def content_hash(path):
+    '''Hash isi file sumber, berubah setiap kali data berubah'''
+    digest = hashlib.sha1()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+def cache_entry_path(path, columns, cache_dir):
+    '''Lokasi entri cache untuk file sumber dan kolom tertentu'''
+    key = hashlib.sha1(
+        f"{CACHE_VERSION}:{content_hash(path)}:{json.dumps(list(columns))}".encode()
+    ).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(path))[0]
+
+    return os.path.join(cache_dir, f"{name}-{key}"), name
+
+def new_entry_dir(entry_path, name):
+    '''Direktori sementara unik per proses untuk menyusun entri cache'''
+    return tempfile.mkdtemp(prefix=f"{name}-", suffix='.tmp', dir=os.path.dirname(entry_path))
+
+def write_entry(tmp_path, dates, values, metadata):
+    '''Menulis isi entri cache (dates.npy, values.npy, metadata.json)'''
+    np.save(os.path.join(tmp_path, 'dates.npy'), dates)
+    np.save(os.path.join(tmp_path, 'values.npy'), values)
+    with open(os.path.join(tmp_path, 'metadata.json'), 'w', encoding='utf-8') as file:
+        json.dump(metadata, file, indent=1)
+
+def publish_entry(tmp_path, entry_path, name):
+    '''
+    Method ini memindahkan entri sementara ke entry_path. Jika proses lain
+    sudah lebih dulu menerbitkan entri yang sama, salinan ini dibuang.
+    Entri lain dari file sumber yang sama (versi lama) lalu dihapus.
+    '''
+    try:
+        os.rename(tmp_path, entry_path)
+    except OSError:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        if not os.path.exists(entry_path):
+            raise
+
+    cache_dir, current = os.path.split(entry_path)
+    for old_entry in os.listdir(cache_dir):
+        if (old_entry.startswith(f"{name}-") and old_entry != current
+                and not old_entry.endswith('.tmp')):
+            shutil.rmtree(os.path.join(cache_dir, old_entry), ignore_errors=True)
+
+def build_cache_entry(path, columns, entry_path, name):
+    '''
+    Method ini membaca CSV, menghitung parameter scaler per kolom
+    lalu menyimpan data ternormalisasi (float32) ke disk
+    '''
+    with span('import_csv'):
+        df = import_data(path)
+
+    with span('scaling'):
+        scalers = {}
+        scaled = np.empty((len(df), len(columns)), dtype=np.float32)
+        for i, column in enumerate(columns):
+            values = df[column].to_numpy(dtype=np.float64)
+            scalers[column] = SeriesScaler(values.min(), values.max())
+            scaled[:, i] = scalers[column].transform(values)
+
+    tmp_path = new_entry_dir(entry_path, name)
+    write_entry(tmp_path, df.index.values.astype('datetime64[ns]'), scaled, {
+        'source': path,
+        'index_name': df.index.name,
+        'columns': list(columns),
+        'scalers': {column: scaler.to_dict() for column, scaler in scalers.items()},
+    })
+    publish_entry(tmp_path, entry_path, name)
+
+def load_scaled_data(path, columns=DEFAULT_COLUMNS, cache_dir=data_config.CACHE_PATH):
+    '''
+    Method ini mengembalikan data ternormalisasi dan dict scaler per kolom.
+    Hasil disimpan di cache_dir dengan kunci hash isi CSV, sehingga
+    proses baru cukup memuat file .npy (memory-map) dan cache otomatis
+    dibuat ulang ketika isi CSV berubah.
+    '''
+    os.makedirs(cache_dir, exist_ok=True)
+    entry_path, name = cache_entry_path(path, columns, cache_dir)
+    if not os.path.exists(entry_path):
+        build_cache_entry(path, columns, entry_path, name)
+
+    with open(os.path.join(entry_path, 'metadata.json'), encoding='utf-8') as file:
+        metadata = json.load(file)
+    dates = np.load(os.path.join(entry_path, 'dates.npy'), mmap_mode='r')
+    values = np.load(os.path.join(entry_path, 'values.npy'), mmap_mode='r')
+
+    df_scaled = pd.DataFrame(
+        {column: values[:, i] for i, column in enumerate(metadata['columns'])},
+        index=pd.DatetimeIndex(np.asarray(dates), name=metadata['index_name']),
+        copy=False
+    )
+    scalers = {
+        column: SeriesScaler(params['data_min'], params['data_max'])
+        for column, params in metadata['scalers'].items()
+    }
+
+    return df_scaled, scalers
+
+def append_npy(file_path, rows):
+    '''
+    Menambahkan baris ke akhir file .npy tanpa menulis ulang isi lama.
+    Header diperbarui di tempat, file ditulis ulang hanya jika panjang
+    header berubah.
+    '''
+    rows = np.ascontiguousarray(rows)
+    with open(file_path, 'r+b') as file:
+        version = np.lib.format.read_magic(file)
+        if version != (1, 0):
+            raise ValueError(f"Versi format .npy {version} tidak didukung")
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+        header_length = file.tell()
+
+        new_shape = (shape[0] + len(rows),) + tuple(shape[1:])
+        header = BytesIO()
+        np.lib.format.write_array_header_1_0(header, {
+            'descr': np.lib.format.dtype_to_descr(dtype),
+            'fortran_order': fortran_order,
+            'shape': new_shape,
+        })
+
+        if len(header.getvalue()) == header_length and not fortran_order:
+            file.seek(0)
+            file.write(header.getvalue())
+            file.seek(0, os.SEEK_END)
+            file.write(rows.astype(dtype, copy=False).tobytes())
+            return
+
+    existing = np.load(file_path)
+    np.save(file_path, np.concatenate([existing, rows.astype(existing.dtype)]))
+
+def ingest_new_rows(path, new_rows, columns=DEFAULT_COLUMNS, cache_dir=data_config.CACHE_PATH):
+    '''
+    Method ini menambahkan data harian baru ke CSV sekaligus memperbarui
+    cache preprocessing: baris baru dinormalisasi lalu ditambahkan ke file
+    .npy. Jika harga baru keluar dari rentang min-max sebelumnya, entri
+    baru (data lama diskalakan ulang + baris baru) disusun di direktori
+    terpisah lalu diterbitkan, karena entri lama mungkin sedang di-memory-map
+    oleh proses lain bersama scaler lamanya.
+    '''
+    os.makedirs(cache_dir, exist_ok=True)
+    old_entry, name = cache_entry_path(path, columns, cache_dir)
+    new_rows = append_data(path, new_rows)
+    new_entry, _ = cache_entry_path(path, columns, cache_dir)
+
+    if not os.path.exists(old_entry):
+        return load_scaled_data(path, columns, cache_dir)
+
+    with open(os.path.join(old_entry, 'metadata.json'), encoding='utf-8') as file:
+        metadata = json.load(file)
+
+    old_scalers = {
+        column: SeriesScaler(params['data_min'], params['data_max'])
+        for column, params in metadata['scalers'].items()
+    }
+    new_scalers = {}
+    scaled = np.empty((len(new_rows), len(columns)), dtype=np.float32)
+    for i, column in enumerate(columns):
+        old_scaler = old_scalers[column]
+        prices = new_rows[column].to_numpy(dtype=np.float64)
+        new_scalers[column] = SeriesScaler(
+            min(old_scaler.data_min_[0], prices.min()),
+            max(old_scaler.data_max_[0], prices.max())
+        )
+        scaled[:, i] = new_scalers[column].transform(prices)
+    new_dates = new_rows.index.values.astype('datetime64[ns]')
+
+    if all(new_scalers[column].to_dict() == old_scalers[column].to_dict() for column in columns):
+        # Rentang tetap: data lama tidak berubah, baris baru cukup ditambahkan
+        append_npy(os.path.join(old_entry, 'values.npy'), scaled)
+        append_npy(os.path.join(old_entry, 'dates.npy'), new_dates)
+        try:
+            os.rename(old_entry, new_entry)
+        except OSError:
+            if not os.path.exists(new_entry):
+                raise
+        return load_scaled_data(path, columns, cache_dir)
+
+    # Rentang berubah: data lama diskalakan ulang (affine, vektor) ke entri baru
+    old_values = np.load(os.path.join(old_entry, 'values.npy'), mmap_mode='r')
+    old_dates = np.load(os.path.join(old_entry, 'dates.npy'), mmap_mode='r')
+    values = np.empty((len(old_values) + len(scaled), len(columns)), dtype=np.float32)
+    for i, column in enumerate(columns):
+        values[:len(old_values), i] = new_scalers[column].transform(
+            old_scalers[column].inverse_transform(old_values[:, i])
+        )
+    values[len(old_values):] = scaled
+    dates = np.concatenate([old_dates, new_dates])
+    del old_values, old_dates
+
+    metadata['scalers'] = {column: scaler.to_dict() for column, scaler in new_scalers.items()}
+    tmp_path = new_entry_dir(new_entry, name)
+    write_entry(tmp_path, dates, values, metadata)
+    publish_entry(tmp_path, new_entry, name)
+
+    return load_scaled_data(path, columns, cache_dir)
@@ -0,0 +1,63 @@
+'''
+Sliding window untuk data deret waktu tanpa menyalin data historis
+'''
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+def as_2d(values):
+    '''Mengubah seri univariat (n,) menjadi (n, 1), multivariat tetap (n, fitur)'''
+    values = np.asarray(values)
+    if values.ndim == 1:
+        return values[:, np.newaxis]
+
+    return values
+
+def sliding_windows(values, look_back=1):
+    '''
+    Method ini membuat pasangan window input x berbentuk
+    (n - look_back, look_back, fitur) dan target y berbentuk
+    (n - look_back, fitur). Keduanya berupa view dari values,
+    jadi tidak ada data yang disalin.
+    '''
+    values = as_2d(values)
+    if len(values) <= look_back:
+        raise ValueError(f"Data minimal {look_back + 1} baris untuk look_back={look_back}")
+
+    x = sliding_window_view(values[:-1], look_back, axis=0).transpose(0, 2, 1)
+    y = values[look_back:]
+
+    return x, y
+
+def windows_at(values, ends, look_back=1):
+    '''
+    Mengambil window yang berakhir tepat sebelum indeks ends,
+    hasilnya (len(ends), look_back, fitur). Setiap ends harus di antara
+    look_back dan len(values)
+    '''
+    values = as_2d(values)
+    ends = np.asarray(ends, dtype=np.intp)
+    if ends.size and (ends.min() < look_back or ends.max() > len(values)):
+        raise ValueError(
+            f"ends harus di antara {look_back} dan {len(values)} untuk look_back={look_back}"
+        )
+    all_windows = sliding_window_view(values, look_back, axis=0).transpose(0, 2, 1)
+
+    return all_windows[ends - look_back]
+
+def shift_window(window, new_values):
+    '''
+    Menggeser window (..., look_back) ke kiri sebanyak jumlah nilai baru
+    (..., k) dan mengisi nilai baru di akhir, langsung di array window
+    '''
+    look_back, n_new = window.shape[-1], new_values.shape[-1]
+    shift = min(n_new, look_back)
+    window[..., :look_back - shift] = window[..., shift:]
+    window[..., look_back - shift:] = new_values[..., n_new - shift:]
+
+def last_window(values, look_back=1):
+    '''Window terakhir dari seri, berbentuk (look_back, fitur) tanpa salinan'''
+    values = as_2d(values)
+    if len(values) < look_back:
+        raise ValueError(f"Data minimal {look_back} baris untuk look_back={look_back}")
+
+    return values[len(values) - look_back:]
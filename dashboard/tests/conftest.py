@@ -0,0 +1,15 @@
+'''
+Konfigurasi pytest: modul dashboard di-import seperti saat dijalankan
+dari root repo (python -m pytest dashboard/tests)
+'''
+import os
+import sys
+
+DASHBOARD_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(DASHBOARD_DIR)
+
+if DASHBOARD_DIR not in sys.path:
+    sys.path.insert(0, DASHBOARD_DIR)
+
+# Path di config relatif terhadap root repo
+os.chdir(REPO_DIR)
@@ -0,0 +1,58 @@
+'''
+Artifact yang ditulis bertahap sama dengan artifact yang ditulis sekaligus,
+dan penulisan bersamaan ke satu artifact tetap aman
+'''
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from forecast_data.artifact import ArtifactWriter, read_artifact, write_artifact
+
+def _chunk(label, start, values):
+    return pd.DataFrame({
+        'Date': pd.date_range(start, periods=len(values)).astype('datetime64[ns]'),
+        'Pasar': label,
+        'Harga': values,
+    })
+
+def test_append_matches_single_write(tmp_path):
+    '''Kategori baru di chunk berikutnya tidak mengubah kode chunk sebelumnya'''
+    chunks = [
+        _chunk('Pasar Wage', '2024-01-01', [1.0, 2.0]),
+        _chunk('Pasar Manis', '2024-01-03', [np.nan, 4.0, 5.0]),
+        _chunk('Pasar Wage', '2024-01-06', [6.0]),
+    ]
+    writer = ArtifactWriter(str(tmp_path / 'appended'), 'model', 3)
+    for chunk in chunks:
+        writer.append(chunk)
+    metadata = writer.close()
+
+    expected = pd.concat(chunks, ignore_index=True)
+    write_artifact(expected, str(tmp_path / 'single'), 'model', 3)
+
+    appended, _ = read_artifact(str(tmp_path / 'appended'))
+    single, _ = read_artifact(str(tmp_path / 'single'))
+    assert metadata['rows'] == len(expected)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['appended', 'single']
+    for df in (appended, single):
+        pd.testing.assert_frame_equal(df.astype({'Pasar': str}), expected)
+
+def _write_many(args):
+    path, worker = args
+    for i in range(5):
+        write_artifact(_chunk(f"Pasar {worker}", '2024-01-01', np.full(1000, worker * 10.0 + i)),
+                       path, f"model-{worker}", 3)
+        df, _ = read_artifact(path)
+        assert len(df) == 1000
+    return worker
+
+def test_concurrent_writers(tmp_path):
+    '''Penulis bersamaan tidak saling menghapus, pembaca selalu melihat artifact lengkap'''
+    path = str(tmp_path / 'shared.forecast')
+    with ProcessPoolExecutor(4) as executor:
+        assert sorted(executor.map(_write_many, [(path, worker) for worker in range(4)])) == [0, 1, 2, 3]
+
+    df, metadata = read_artifact(path)
+    assert len(df) == metadata['rows'] == 1000
+    assert df['Harga'].nunique() == 1
+    assert [entry for entry in os.listdir(path) if entry.endswith('.tmp')] == []
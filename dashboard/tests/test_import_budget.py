@@ -0,0 +1,11 @@
+'''
+Budget waktu import dan modul berat, memakai pengukuran di
+benchmarks/import_budget.py
+'''
+import pytest
+from benchmarks.import_budget import BUDGETS, check_budgets
+
+@pytest.mark.parametrize('name', sorted(BUDGETS))
+def test_import_budget(name):
+    '''Import di proses baru tidak melebihi budget dan tidak memuat modul berat'''
+    assert check_budgets({name: BUDGETS[name]}) == []
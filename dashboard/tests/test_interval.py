@@ -0,0 +1,29 @@
+'''
+Residual per horizon dan bootstrap noise untuk model direct multi-horizon
+'''
+import numpy as np
+from forecast_data.interval import bootstrap_noise, horizon_residuals
+
+class LastValueModel:
+    '''Model direct sederhana: semua H output sama dengan nilai terakhir window'''
+    def __init__(self, horizon):
+        self.horizon = horizon
+
+    def predict(self, x, verbose=0):
+        return np.repeat(x[:, 0, -1:], self.horizon, axis=1)
+
+def test_residuals_per_horizon():
+    '''Kolom h berisi error output ke-h terhadap data aktual h+1 langkah ke depan'''
+    values = np.arange(10, dtype=np.float32)
+    residuals = horizon_residuals(LastValueModel(3), values, horizon=3)
+
+    assert residuals.shape == (7, 3)
+    np.testing.assert_array_equal(residuals, np.tile([1, 2, 3], (7, 1)))
+
+def test_noise_uses_matching_horizon_column():
+    '''Setiap output dalam satu blok mendapat residual dari kolom horizon-nya'''
+    residuals = np.tile(np.array([[1, 2, 3]], dtype=np.float32), (5, 1))
+    noise = bootstrap_noise([residuals], 4, 8, np.random.default_rng(0))
+
+    assert noise.shape == (4, 8)
+    np.testing.assert_array_equal(noise, np.tile([1, 2, 3, 1, 2, 3, 1, 2], (4, 1)))
@@ -0,0 +1,51 @@
+'''
+Paritas engine NumPy terhadap model Keras dan export bobot yang aman
+dipakai beberapa proses sekaligus
+'''
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pytest
+import config.data as data_config
+import config.model as model_config
+from prepare_data.preprocess import load_scaled_data
+from forecast_data.numpy_lstm import NumpyLSTM, check_parity, export_weights, load_numpy_model
+
+def _load_model_files(paths):
+    npz_path, model_path = paths
+    return len(load_numpy_model(npz_path, model_path).layers)
+
+def test_parity_with_keras(tmp_path):
+    '''Output NumPy sama dengan Keras pada seluruh data historis'''
+    pytest.importorskip('h5py')
+    os.environ.setdefault('TF_USE_LEGACY_KERAS', '1')
+    tf = pytest.importorskip('tensorflow')
+
+    npz_path = tmp_path / 'model.npz'
+    export_weights(model_config.MODEL_FILE_NAME, str(npz_path))
+    numpy_model = NumpyLSTM.from_npz(str(npz_path))
+    keras_model = tf.keras.models.load_model(model_config.MODEL_FILE_NAME, compile=False)
+
+    for data_path in (data_config.DATA_BAWANG_MERAH, data_config.DATA_DAGING_AYAM):
+        df_scaled, _ = load_scaled_data(data_path, cache_dir=str(tmp_path / 'cache'))
+        for column_name in df_scaled.columns:
+            x = df_scaled[column_name].values.reshape(-1, 1, 1)
+            assert check_parity(keras_model, numpy_model, x) <= 1e-5
+
+def test_concurrent_first_load(tmp_path):
+    '''Beberapa worker yang mengekspor bobot bersamaan tidak membaca file setengah jadi'''
+    pytest.importorskip('h5py')
+    model_path = tmp_path / 'model.h5'
+    shutil.copy(model_config.MODEL_FILE_NAME, model_path)
+    npz_path = tmp_path / 'model.npz'
+
+    with ProcessPoolExecutor(8) as executor:
+        for _ in range(5):
+            if npz_path.exists():
+                npz_path.unlink()
+            results = list(executor.map(_load_model_files, [(str(npz_path), str(model_path))] * 16))
+            assert results == [3] * 16
+
+    assert [path.name for path in tmp_path.iterdir() if path.suffix == '.tmp'] == []
+    assert np.isfinite(NumpyLSTM.from_npz(str(npz_path)).predict(np.zeros((1, 1, 1)))).all()
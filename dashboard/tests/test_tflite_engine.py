@@ -0,0 +1,64 @@
+'''
+Paritas engine TFLite (float16 dan int8) terhadap model Keras dan konversi
+yang aman dijalankan beberapa proses sekaligus
+'''
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pytest
+import config.model as model_config
+from config.commodity import COMMODITIES
+from prepare_data.preprocess import load_scaled_data
+from forecast_data.forecast import rollout
+from forecast_data.numpy_lstm import check_parity
+from forecast_data.tflite_engine import QUANTIZATIONS, load_tflite_model
+
+# Toleransi selisih satu langkah dan rollout 93 hari (skala 0-1) per varian
+TOLERANCES = {'float16': (1e-4, 1e-3), 'int8': (5e-3, 5e-2)}
+
+def _import_tensorflow():
+    os.environ.setdefault('TF_USE_LEGACY_KERAS', '1')
+    return pytest.importorskip('tensorflow')
+
+def _load_tflite_horizon(args):
+    model_path, quantization = args
+    return load_tflite_model(model_path, quantization).horizon
+
+@pytest.mark.parametrize('quantization', QUANTIZATIONS)
+def test_parity_with_keras(tmp_path, quantization):
+    '''Output TFLite mendekati Keras untuk satu langkah dan rollout 93 hari'''
+    tf = _import_tensorflow()
+    model_path = tmp_path / 'model.h5'
+    shutil.copy(model_config.MODEL_FILE_NAME, model_path)
+    keras_model = tf.keras.models.load_model(str(model_path), compile=False)
+    tflite_model = load_tflite_model(str(model_path), quantization)
+
+    series = []
+    for commodity in COMMODITIES.values():
+        df_scaled, _ = load_scaled_data(commodity['history'], commodity['markets'],
+                                        cache_dir=str(tmp_path / 'cache'))
+        series.extend(df_scaled[market].values for market in commodity['markets'])
+
+    one_step, full_path = TOLERANCES[quantization]
+    for values in series:
+        check_parity(keras_model, tflite_model, np.asarray(values).reshape(-1, 1, 1), one_step)
+
+    last_windows = np.array([values[-1:] for values in series])
+    expected_path = rollout(keras_model, last_windows, 93)
+    actual_path = rollout(tflite_model, last_windows, 93)
+    assert np.max(np.abs(expected_path - actual_path)) <= full_path
+
+def test_concurrent_first_conversion(tmp_path):
+    '''Worker yang mengonversi bersamaan tidak saling menimpa file sementara'''
+    _import_tensorflow()
+    model_path = tmp_path / 'model.h5'
+    shutil.copy(model_config.MODEL_FILE_NAME, model_path)
+
+    # spawn: fork setelah TensorFlow dimuat bisa membuat worker macet
+    with ProcessPoolExecutor(4, mp_context=multiprocessing.get_context('spawn')) as executor:
+        results = list(executor.map(_load_tflite_horizon, [(str(model_path), 'float16')] * 4))
+
+    assert results == [1] * 4
+    assert [path.name for path in tmp_path.iterdir() if path.name.endswith('.tmp')] == []
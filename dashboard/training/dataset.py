@@ -0,0 +1,60 @@
+'''
+Dataset tf.data untuk pelatihan: window dibuat saat streaming, bukan
+ditumpuk di memori terlebih dahulu
+'''
+import numpy as np
+import tensorflow as tf
+
+def series_offsets(series_values):
+    '''
+    Menggabungkan beberapa seri menjadi satu array datar dan
+    mengembalikan (array, offset awal setiap seri)
+    '''
+    lengths = [len(values) for values in series_values]
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+    flat = np.concatenate([np.asarray(values, dtype=np.float32) for values in series_values])
+
+    return flat, offsets
+
+def split_window_starts(series_values, look_back=1, val_fraction=0.2, horizon=1):
+    '''
+    Method ini menghitung indeks awal window (di array datar) untuk data
+    latih dan validasi. Pembagian kronologis per seri: bagian akhir setiap
+    seri menjadi validasi, dan window beserta horizon target tidak pernah
+    melewati batas seri.
+    '''
+    _, offsets = series_offsets(series_values)
+    train_starts, val_starts = [], []
+    for offset, values in zip(offsets, series_values):
+        n_windows = len(values) - look_back - horizon + 1
+        if n_windows <= 0:
+            continue
+        n_train = int(round(n_windows * (1 - val_fraction)))
+        starts = offset + np.arange(n_windows, dtype=np.int64)
+        train_starts.append(starts[:n_train])
+        val_starts.append(starts[n_train:])
+
+    return np.concatenate(train_starts), np.concatenate(val_starts)
+
+def window_dataset(flat, starts, look_back=1, batch_size=64, shuffle=False, seed=0, horizon=1):
+    '''
+    Method ini membuat tf.data.Dataset berisi (x, y) dengan x berbentuk
+    (batch, 1, look_back), sama dengan input model saat peramalan, dan y
+    berisi horizon nilai berikutnya (1 untuk model rekursif).
+    Window diambil dari array datar dengan map paralel, di-cache setelah
+    dibuat, diacak dengan seed tetap, lalu di-prefetch.
+    '''
+    values = tf.constant(flat)
+
+    def make_window(start):
+        x = tf.reshape(values[start:start + look_back], (1, look_back))
+        y = values[start + look_back:start + look_back + horizon]
+        return x, y
+
+    dataset = tf.data.Dataset.from_tensor_slices(starts)
+    dataset = dataset.map(make_window, num_parallel_calls=tf.data.AUTOTUNE, deterministic=True)
+    dataset = dataset.cache()
+    if shuffle:
+        dataset = dataset.shuffle(len(starts), seed=seed, reshuffle_each_iteration=True)
+
+    return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
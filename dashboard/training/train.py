@@ -0,0 +1,186 @@
+'''
+Melatih ulang model LSTM dari data historis di katalog
+
+Contoh (dijalankan dari root repo):
+    PYTHONPATH=dashboard python -m training.train --epochs 100 --seed 42
+Model disimpan sebagai models/lstm-v<N>.h5 dengan metadata lstm-v<N>.json.
+Untuk memakainya, arahkan MODEL_FILE_NAME di config/model.py ke file tersebut.
+
+Dengan --horizon H dilatih model direct multi-horizon (Dense(H)) yang
+meramalkan H hari sekaligus dalam satu forward pass:
+    PYTHONPATH=dashboard python -m training.train --horizon 93
+'''
+import argparse
+import glob
+import json
+import os
+import re
+import time
+from datetime import datetime, timezone
+import config.model as model_config
+from config.commodity import COMMODITIES
+from prepare_data.preprocess import content_hash, load_scaled_data
+from forecast_data.pipeline import catalog_series
+
+def configure(seed, threads=0):
+    '''
+    Seed dan determinisme TensorFlow. threads=0 berarti semua core CPU
+    dipakai sesuai bawaan TensorFlow.
+    '''
+    import tensorflow as tf
+
+    tf.config.set_visible_devices([], 'GPU')
+    if threads:
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(threads)
+    tf.keras.utils.set_random_seed(seed)
+    tf.config.experimental.enable_op_determinism()
+
+def load_training_series(commodity_keys=None):
+    '''
+    Method ini memuat seri ternormalisasi dari cache preprocessing
+    (import_data + scaler per kolom yang tersimpan), mengembalikan
+    list nilai seri dan info sumber untuk metadata
+    '''
+    series_values = []
+    sources = []
+    scaled = {}
+    for commodity_key, market in catalog_series(commodity_keys):
+        commodity = COMMODITIES[commodity_key]
+        if commodity_key not in scaled:
+            scaled[commodity_key] = load_scaled_data(commodity['history'], commodity['markets'])
+        df_scaled, scalers = scaled[commodity_key]
+
+        series_values.append(df_scaled[market].values)
+        sources.append({
+            'commodity': commodity_key,
+            'market': market,
+            'history': commodity['history'],
+            'content_hash': content_hash(commodity['history']),
+            'rows': len(df_scaled),
+            'last_date': str(df_scaled.index[-1].date()),
+            'scaler': scalers[market].to_dict(),
+        })
+
+    return series_values, sources
+
+def build_model(look_back=1, learning_rate=1e-3, horizon=1):
+    '''
+    Arsitektur sama dengan bestModel_lstm.h5: LSTM(128) -> LSTM(64) -> Dense(1).
+    horizon > 1 membuat model direct dengan Dense(horizon).
+    '''
+    import tensorflow as tf
+
+    model = tf.keras.Sequential([
+        tf.keras.layers.LSTM(128, return_sequences=True, input_shape=(1, look_back)),
+        tf.keras.layers.LSTM(64),
+        tf.keras.layers.Dense(horizon),
+    ])
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate),
+                  loss='mean_squared_error', metrics=['mae'])
+
+    return model
+
+def next_model_path(prefix=model_config.TRAINED_MODEL_PREFIX):
+    '''Path model berikutnya: <prefix>-v<N>.h5 dengan N terbesar + 1'''
+    versions = [
+        int(match.group(1))
+        for path in glob.glob(f"{prefix}-v*.h5")
+        if (match := re.search(r"-v(\d+)\.h5$", path))
+    ]
+
+    return f"{prefix}-v{max(versions, default=0) + 1}.h5"
+
+def train(epochs=100, batch_size=64, look_back=1, val_fraction=0.2, patience=10,
+          learning_rate=1e-3, seed=42, threads=0, commodity_keys=None,
+          prefix=model_config.TRAINED_MODEL_PREFIX, horizon=1):
+    '''
+    Method ini melatih model dengan early stopping pada val_loss (bobot
+    terbaik dipulihkan), lalu menyimpan model berversi dan metadata
+    sidecar (.json). Mengembalikan path model dan metadata.
+    '''
+    configure(seed, threads)
+    import tensorflow as tf
+    from .dataset import series_offsets, split_window_starts, window_dataset
+
+    series_values, sources = load_training_series(commodity_keys)
+    flat, _ = series_offsets(series_values)
+    train_starts, val_starts = split_window_starts(series_values, look_back, val_fraction, horizon)
+    train_data = window_dataset(flat, train_starts, look_back, batch_size, shuffle=True, seed=seed,
+                                horizon=horizon)
+    val_data = window_dataset(flat, val_starts, look_back, batch_size, horizon=horizon)
+
+    model = build_model(look_back, learning_rate, horizon)
+    early_stopping = tf.keras.callbacks.EarlyStopping(
+        monitor='val_loss', patience=patience, restore_best_weights=True
+    )
+    start = time.perf_counter()
+    history = model.fit(train_data, validation_data=val_data, epochs=epochs,
+                        callbacks=[early_stopping], verbose=2)
+    seconds = time.perf_counter() - start
+
+    val_loss = history.history['val_loss']
+    best_epoch = min(range(len(val_loss)), key=val_loss.__getitem__)
+
+    model_path = next_model_path(prefix)
+    model.save(model_path)
+    metadata = {
+        'model_file': os.path.basename(model_path),
+        'version': int(re.search(r"-v(\d+)\.h5$", model_path).group(1)),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'tensorflow': tf.__version__,
+        'params': {
+            'epochs': epochs, 'batch_size': batch_size, 'look_back': look_back,
+            'horizon': horizon,
+            'val_fraction': val_fraction, 'patience': patience,
+            'learning_rate': learning_rate, 'seed': seed,
+        },
+        'result': {
+            'epochs_run': len(val_loss),
+            'best_epoch': best_epoch + 1,
+            'loss': float(history.history['loss'][best_epoch]),
+            'val_loss': float(val_loss[best_epoch]),
+            'val_mae': float(history.history['val_mae'][best_epoch]),
+            'train_windows': int(len(train_starts)),
+            'val_windows': int(len(val_starts)),
+            'seconds': seconds,
+        },
+        'data': sources,
+    }
+    with open(f"{os.path.splitext(model_path)[0]}.json", 'w', encoding='utf-8') as file:
+        json.dump(metadata, file, indent=1)
+
+    return model_path, metadata
+
+def main():
+    '''
+    Fungsi utama command line
+    '''
+    parser = argparse.ArgumentParser(description="Pelatihan ulang model LSTM")
+    parser.add_argument("--epochs", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--look-back", type=int, default=1)
+    parser.add_argument("--horizon", type=int, default=1,
+                        help="Jumlah hari per forward pass, >1 untuk model direct multi-horizon")
+    parser.add_argument("--val-fraction", type=float, default=0.2,
+                        help="Bagian akhir setiap seri yang dipakai untuk validasi")
+    parser.add_argument("--patience", type=int, default=10, help="Early stopping (epoch)")
+    parser.add_argument("--learning-rate", type=float, default=1e-3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--threads", type=int, default=0,
+                        help="Jumlah thread TensorFlow, 0 = semua core")
+    parser.add_argument("--commodity", action="append", choices=sorted(COMMODITIES),
+                        help="Hanya komoditas tertentu (default semua di katalog)")
+    args = parser.parse_args()
+
+    model_path, metadata = train(
+        args.epochs, args.batch_size, args.look_back, args.val_fraction, args.patience,
+        args.learning_rate, args.seed, args.threads, args.commodity, horizon=args.horizon
+    )
+    result = metadata['result']
+    print(f"Model disimpan di {model_path} (epoch terbaik {result['best_epoch']}/"
+          f"{result['epochs_run']}, val_loss {result['val_loss']:.6f}, "
+          f"{result['seconds']:.1f} detik)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+from . import page
\ No newline at end of file
@@ -0,0 +1,64 @@
+'''
+Grafik interaktif histori lengkap dan forecast per pasar
+'''
+import pandas as pd
+import streamlit as st
+from .downsample import build_tiers, select_range
+
+# Jumlah titik maksimum per pasar dan segmen yang dikirim ke browser
+CHART_POINTS = 500
+
+SEGMENTS = ('Historical Data', 'Forecast')
+
+@st.cache_resource(max_entries=32)
+def load_chart_tiers(key, version, labels, _df_gab):
+    '''
+    Tier downsampling per (pasar, segmen) dibuat sekali per komoditas
+    dan versi data.
+    cache_resource dipakai agar array tier tidak disalin setiap rerun.
+    '''
+    is_forecast = (_df_gab['Keterangan'] == 'Forecast').to_numpy()
+    tiers = {}
+    for segment in SEGMENTS:
+        mask = is_forecast if segment == 'Forecast' else ~is_forecast
+        dates = _df_gab.index[mask]
+        for label in labels:
+            tiers[label, segment] = build_tiers(dates, _df_gab[label].to_numpy()[mask], CHART_POINTS)
+
+    return tiers
+
+def chart_data(tiers, labels, start_date, end_date, n_points=CHART_POINTS):
+    '''
+    Method ini menyusun data grafik format panjang (Date, Pasar, Harga,
+    Keterangan) untuk rentang tanggal terpilih, paling banyak n_points
+    titik per pasar dan segmen
+    '''
+    frames = []
+    for segment in SEGMENTS:
+        for label in labels:
+            dates, values = select_range(tiers[label, segment], start_date, end_date, n_points)
+            frames.append(pd.DataFrame({
+                'Date': dates, 'Pasar': label, 'Harga': values, 'Keterangan': segment
+            }))
+
+    return pd.concat(frames, ignore_index=True)
+
+def render_price_chart(df_gab, key, version, labels, start_date, end_date):
+    '''
+    Method ini menampilkan grafik garis interaktif (zoom/pan sumbu waktu)
+    dari histori dan forecast semua pasar; df_gab ber-index Date
+    '''
+    import altair as alt
+
+    tiers = load_chart_tiers(key, version, tuple(labels), df_gab)
+    source = chart_data(tiers, labels, start_date, end_date)
+    chart = alt.Chart(source).mark_line().encode(
+        x=alt.X('Date:T', title='Tanggal'),
+        y=alt.Y('Harga:Q', title='Harga (Rp)', scale=alt.Scale(zero=False)),
+        color=alt.Color('Pasar:N'),
+        strokeDash=alt.StrokeDash('Keterangan:N', sort=list(SEGMENTS)),
+        tooltip=[alt.Tooltip('Date:T', title='Tanggal'), 'Pasar:N',
+                 alt.Tooltip('Harga:Q', format=',.0f'), 'Keterangan:N'],
+    ).interactive(bind_y=False)
+
+    st.altair_chart(chart, use_container_width=True)
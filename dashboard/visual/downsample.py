@@ -0,0 +1,86 @@
+'''
+Downsampling seri waktu untuk grafik dengan Largest-Triangle-Three-Buckets (LTTB)
+
+LTTB memilih satu titik per bucket yang membentuk segitiga terbesar dengan
+titik terpilih sebelumnya dan rata-rata bucket berikutnya, sehingga puncak
+dan lembah tetap terlihat walaupun jumlah titik jauh berkurang.
+'''
+import numpy as np
+
+# Setiap tier berisi 1/TIER_FACTOR titik dari tier sebelumnya
+TIER_FACTOR = 4
+
+def lttb_indices(x, y, n_out):
+    '''
+    Method ini mengembalikan index titik terpilih (terurut) dari seri
+    (x, y) tanpa NaN. Titik pertama dan terakhir selalu ikut.
+    '''
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])[:max(n_out, 0)]
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # n_out - 2 bucket di antara titik pertama dan terakhir
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Rata-rata setiap bucket (bucket terakhir diikuti titik terakhir)
+    ends = np.append(edges[1:], n)
+    starts = np.append(edges[1:-1], n - 1)
+    sum_x = np.add.reduceat(x, starts) if len(starts) else np.empty(0)
+    sum_y = np.add.reduceat(y, starts) if len(starts) else np.empty(0)
+    counts = np.diff(np.append(starts, n))
+    avg_x, avg_y = sum_x / counts, sum_y / counts
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], ends[i]
+        area = np.abs(
+            (x[a] - avg_x[i]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y[i] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+def build_tiers(dates, values, min_points):
+    '''
+    Method ini membuat tier downsampling dari seri lengkap: tier 0 adalah
+    data asli tanpa NaN, tier berikutnya LTTB dari tier sebelumnya dengan
+    1/TIER_FACTOR titik, sampai jumlah titik kurang dari min_points.
+    Mengembalikan list (dates, values).
+    '''
+    dates = np.asarray(dates, dtype='datetime64[ns]')
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    tiers = [(dates[valid], values[valid])]
+    while len(tiers[-1][0]) // TIER_FACTOR >= min_points:
+        tier_dates, tier_values = tiers[-1]
+        selected = lttb_indices(tier_dates.view(np.int64), tier_values,
+                                len(tier_dates) // TIER_FACTOR)
+        tiers.append((tier_dates[selected], tier_values[selected]))
+
+    return tiers
+
+def select_range(tiers, start, end, n_points):
+    '''
+    Method ini mengambil titik dalam rentang [start, end] dengan paling
+    banyak n_points titik. Dipakai tier paling kasar yang masih punya
+    cukup titik di rentang itu, lalu LTTB hanya pada potongan tersebut,
+    sehingga biayanya tidak tergantung panjang histori.
+    '''
+    start, end = np.datetime64(start, 'ns'), np.datetime64(end, 'ns')
+    for tier_dates, tier_values in reversed(tiers):
+        lo = np.searchsorted(tier_dates, start, side='left')
+        hi = np.searchsorted(tier_dates, end, side='right')
+        if hi - lo >= n_points:
+            break
+
+    dates, values = tier_dates[lo:hi], tier_values[lo:hi]
+    selected = lttb_indices(dates.view(np.int64), values, n_points)
+
+    return dates[selected], values[selected]
@@ -0,0 +1,61 @@
+'''
+Tampilan status job peramalan yang berjalan di background
+'''
+import time
+import uuid
+import streamlit as st
+from forecast_data.jobs import CANCELLED, DONE, FAILED
+
+def _rerun():
+    # st.rerun hanya ada di Streamlit versi baru
+    rerun = getattr(st, 'rerun', None) or st.experimental_rerun
+    rerun()
+
+def session_id():
+    '''Id sesi ini sebagai subscriber job'''
+    return st.session_state.setdefault('job_subscriber', uuid.uuid4().hex)
+
+def request_job(manager, key, function, *args, publish=None, timing=None):
+    '''
+    Method ini meminta job ke manager atas nama sesi ini, kecuali job
+    dengan key yang sama sudah dibatalkan di sesi ini (agar rerun tidak
+    memulainya lagi). publish dan timing diteruskan ke manager.submit.
+    '''
+    cancelled = st.session_state.setdefault('cancelled_jobs', set())
+    if key in cancelled:
+        st.warning("Peramalan dibatalkan")
+        if st.button("Jalankan lagi"):
+            cancelled.discard(key)
+            _rerun()
+        return None
+
+    return manager.submit(key, function, *args, publish=publish, subscriber=session_id(),
+                          timing=timing)
+
+def render_job_status(manager, job, poll_interval=0.5):
+    '''
+    Method ini menampilkan progress job. Selama job berjalan halaman
+    dijalankan ulang setiap poll_interval detik, jadi script tidak pernah
+    menunggu perhitungan. Tombol batal hanya melepas sesi ini; job baru
+    berhenti jika tidak ada sesi lain yang menunggu. Mengembalikan True
+    jika hasil sudah tersedia.
+    '''
+    if job.status == DONE:
+        return True
+    if job.status == FAILED:
+        st.error(f"Peramalan gagal: {job.error}")
+        return False
+    if job.status == CANCELLED:
+        st.warning("Peramalan dibatalkan")
+        return False
+
+    st.progress(job.progress)
+    st.write(job.message or "Menunggu giliran....")
+    if st.button("Batalkan"):
+        manager.detach(job, session_id())
+        st.session_state.setdefault('cancelled_jobs', set()).add(job.key)
+        _rerun()
+
+    time.sleep(poll_interval)
+    _rerun()
+    return False
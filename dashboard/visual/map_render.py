@@ -0,0 +1,63 @@
+'''
+Render grafik popup dan peta folium untuk halaman komoditas
+'''
+import base64
+from io import BytesIO
+import matplotlib
+import matplotlib.pyplot as plt
+import seaborn as sns
+import folium
+
+# Render tanpa GUI, gambar hanya disimpan ke PNG
+matplotlib.use('Agg')
+
+MAX_WIDTH = 1000
+
+def render_forecast_png(dates, values, title):
+    '''
+    Method ini menggambar grafik forecast dan mengembalikan
+    tag <img> dengan gambar PNG dalam base64
+    '''
+    sns.set(style='dark')
+    fig, ax = plt.subplots(figsize=(7, 3))
+    ax.plot(
+        dates,
+        values,
+        color='red',
+        label='Forecast',
+        linestyle='--',
+    )
+    ax.set_title(title, fontsize=15)
+    ax.tick_params(axis='y', labelsize=7)
+    ax.tick_params(axis='x', labelsize=7, rotation=17)
+
+    image_stream = BytesIO()
+    fig.savefig(image_stream, format='png')
+    plt.close(fig)
+
+    image_base64 = base64.b64encode(image_stream.getvalue()).decode("utf-8")
+
+    return f'<img src="data:image/png;base64,{image_base64}">'
+
+def render_market_map(location, markers, zoom_start=15):
+    '''
+    Method ini membuat peta folium dengan marker pasar dan
+    mengembalikan HTML lengkapnya. markers berisi list tuple
+    (koordinat, nama pasar, html popup).
+    '''
+    m = folium.Map(
+        location=location,
+        zoom_start=zoom_start,
+        width='100%',
+        height='100%'
+    )
+
+    for coordinate, market_name, popup_html in markers:
+        folium.Marker(
+            coordinate,
+            popup=folium.Popup(popup_html, max_width=MAX_WIDTH),
+            icon=folium.Icon(color='blue', icon='location', prefix='fa-solid fa-shop'),
+            tooltip=str(market_name)
+        ).add_to(m)
+
+    return m.get_root().render()
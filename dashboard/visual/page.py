@@ -0,0 +1,229 @@
+'''
+Halaman visualisasi hasil peramalan untuk satu komoditas
+'''
+import os
+from functools import cached_property
+import numpy as np
+import pandas as pd
+import streamlit as st
+import streamlit.components.v1 as components
+from config.commodity import COMMODITIES, MARKETS, MAP_CENTER
+from forecast_data.artifact import artifact_version, read_artifact
+from visual.chart import render_price_chart
+
+# Jumlah baris tabel harga per halaman
+TABLE_PAGE_SIZE = 100
+
+@st.cache_data
+def load_and_prepare_data(file_path, date_columns):
+    '''Memuat data dari file Excel dengan caching'''
+    df = pd.read_excel(file_path)
+    df.sort_values(by=date_columns, inplace=True)
+    df.reset_index(inplace=True)
+    for column in date_columns:
+        df[column] = pd.to_datetime(df[column])
+
+    return df
+
+@st.cache_data
+def load_forecast_data(artifact_path, excel_path, version):
+    '''Memuat hasil peramalan dari artifact, Excel hanya sebagai cadangan'''
+    if version.startswith('xlsx:'):
+        return load_and_prepare_data(excel_path, ["Date"])
+
+    df, _ = read_artifact(artifact_path)
+    df = df.sort_values(by="Date").reset_index(drop=True)
+
+    return df
+
+@st.cache_data
+def render_map_html(key, version, markets, _forecast_data):
+    '''
+    Render grafik popup dan peta sekali untuk setiap komoditas dan versi
+    data forecast. key ikut kunci cache karena versi cadangan Excel (mtime)
+    dan daftar pasar bisa sama untuk komoditas berbeda.
+    '''
+    # matplotlib dan folium hanya dimuat saat cache render kosong
+    from visual.map_render import render_forecast_png, render_market_map
+
+    markers = []
+    for market in markets:
+        # Pasar tanpa koordinat di katalog tidak ditampilkan di peta
+        if 'location' not in MARKETS[market]:
+            continue
+        label = MARKETS[market]['label']
+        markers.append((
+            MARKETS[market]['location'],
+            label,
+            render_forecast_png(_forecast_data.index, _forecast_data[label], f'Forecast {label}')
+        ))
+
+    return render_market_map(MAP_CENTER, markers)
+
+def format_rupiah(x):
+    '''Mengonversi kolom Currency menjadi format mata uang Rupiah'''
+    if pd.notnull(x):
+        return f"Rp {x:,.2f}".replace(',', '.')
+
+    return x
+
+# Di atas batas ini nilai sen (x * 100) tidak muat di int64
+MAX_VECTOR_RUPIAH = 9e15
+
+def format_rupiah_array(values):
+    '''
+    Versi vektor dari format_rupiah dengan format yang sama. Karakter
+    disusun sebagai matriks byte dari digit hasil operasi integer, tanpa
+    memanggil fungsi Python per baris. NaN tetap NaN; inf dan nilai di atas
+    MAX_VECTOR_RUPIAH diformat dengan format_rupiah. Pembulatan tepat
+    setengah sen bisa berbeda satu sen karena dihitung dari x * 100.
+    '''
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(values.shape, np.nan, dtype=object)
+    valid = np.abs(values) < MAX_VECTOR_RUPIAH
+    for i in np.flatnonzero(~valid & ~np.isnan(values)):
+        result.flat[i] = format_rupiah(values.flat[i])
+    if not valid.any():
+        return result
+
+    cents = np.round(np.abs(values[valid]) * 100).astype(np.int64)
+    whole, fraction = np.divmod(cents, 100)
+
+    # Matriks karakter rata kanan: digit, '.' setiap 3 digit, lalu '.' dan 2 digit sen
+    n_digits = len(str(whole.max()))
+    width = n_digits + (n_digits - 1) // 3 + 3
+    chars = np.full((len(whole), width), ord(' '), dtype=np.uint8)
+    chars[:, -3] = ord('.')
+    chars[:, -2] = ord('0') + fraction // 10
+    chars[:, -1] = ord('0') + fraction % 10
+    column = width - 4
+    for j in range(n_digits):
+        if j and j % 3 == 0:
+            chars[:, column] = np.where(whole >= 10 ** j, ord('.'), ord(' '))
+            column -= 1
+        shown = (whole >= 10 ** j) | (j == 0)
+        chars[:, column] = np.where(shown, ord('0') + whole // 10 ** j % 10, ord(' '))
+        column -= 1
+
+    text = np.char.lstrip(chars.view(f'S{width}').ravel())
+    prefix = np.where(values[valid] < 0, b'Rp -', b'Rp ')
+    result[valid] = np.char.add(prefix, text).astype(str)
+
+    return result
+
+class CommodityData:
+    '''
+    Dataset satu komoditas dari registry. Setiap dataset baru dibaca
+    saat pertama kali diakses, sehingga halaman hanya memuat data yang
+    benar-benar ditampilkan.
+    '''
+    def __init__(self, key):
+        self.key = key
+        self.config = COMMODITIES[key]
+
+    @cached_property
+    def version(self):
+        '''Versi artifact forecast, atau waktu modifikasi file Excel cadangan'''
+        version = artifact_version(self.config['forecast'])
+        if version is None:
+            version = f"xlsx:{os.path.getmtime(self.config['excel'])}"
+
+        return version
+
+    @cached_property
+    def combined(self):
+        '''Data historis dan forecast gabungan semua pasar'''
+        return load_forecast_data(self.config['forecast'], self.config['excel'], self.version)
+
+def filter_date_range(df_gab, start_date, end_date):
+    '''Baris dengan tanggal dalam rentang (index Date terurut, tanpa salinan)'''
+    return df_gab.loc[pd.Timestamp(start_date):pd.Timestamp(end_date)]
+
+def format_table(df_page, labels):
+    '''
+    Method ini memformat satu halaman tabel harga: tanggal sebagai teks
+    dan harga dalam format Rupiah
+    '''
+    table = {'Date': df_page.index.strftime('%Y-%m-%d')}
+    for label in labels:
+        table[label] = format_rupiah_array(df_page[label].to_numpy())
+    table['Keterangan'] = df_page['Keterangan'].to_numpy()
+
+    return pd.DataFrame(table)
+
+def prepare_table(df_gab, labels, start_date, end_date, page=1, page_size=TABLE_PAGE_SIZE):
+    '''
+    Method ini menyiapkan satu halaman tabel harga untuk rentang tanggal
+    terpilih (df_gab ber-index Date). Hanya baris di halaman itu yang
+    diformat. Mengembalikan tabel dan jumlah baris dalam rentang.
+    '''
+    df_range = filter_date_range(df_gab, start_date, end_date)
+    start = (page - 1) * page_size
+
+    return format_table(df_range.iloc[start:start + page_size], labels), len(df_range)
+
+def render_price_table(df_gab, labels, start_date, end_date, key, page_size=TABLE_PAGE_SIZE):
+    '''Tabel harga dengan pilihan halaman, hanya halaman aktif yang dikirim ke browser'''
+    n_rows = len(filter_date_range(df_gab, start_date, end_date))
+    n_pages = max(-(-n_rows // page_size), 1)
+    # Key ikut rentang tanggal agar halaman kembali ke 1 saat rentang berubah
+    page = st.number_input(
+        f"Halaman (dari {n_pages})", min_value=1, max_value=n_pages, value=1,
+        key=f"page-{key}-{start_date}-{end_date}"
+    )
+    table, _ = prepare_table(df_gab, labels, start_date, end_date, page, page_size)
+
+    first_row = (page - 1) * page_size
+    st.caption(f"Baris {min(first_row + 1, n_rows)}-{first_row + len(table)} dari {n_rows}")
+    st.dataframe(table.set_index('Date'), use_container_width=True)
+
+def render_commodity_page(key):
+    '''
+    Method ini menampilkan halaman forecast satu komoditas:
+    peta pasar dengan grafik forecast, grafik histori lengkap
+    dan tabel harga
+    '''
+    st.set_page_config(layout="wide")
+
+    data = CommodityData(key)
+    markets = data.config['markets']
+    labels = [MARKETS[market]['label'] for market in markets]
+
+    df_gab = data.combined
+    min_date = df_gab["Date"].min()
+    max_date = df_gab["Date"].max()
+
+    # sidebar sebelah kiri
+    with st.sidebar:
+        # Mengambil start_date & end_date dari date_input
+        start_date, end_date = st.date_input(
+            label='Rentang Waktu', min_value=min_date,
+            max_value=max_date,
+            value=[min_date, max_date]
+        )
+        show_chart = st.checkbox("Grafik interaktif histori lengkap", value=True)
+
+    df_gab = df_gab.set_index('Date')
+
+    # Header
+    st.header(f"Forecast Harga {data.config['title']} :sparkles:")
+
+    #Filter Forecast data
+    forecast_data = df_gab[df_gab['Keterangan'] == 'Forecast']
+
+    # Grafik popup dan peta diambil dari cache selama data tidak berubah
+    map_html = render_map_html(key, data.version, markets, forecast_data)
+
+    with st.expander("Find market on maps", expanded=True):
+        st.subheader('Map')
+        components.html(map_html, height=450)
+
+    # Grafik histori + forecast, jumlah titik per seri dibatasi (LTTB)
+    if show_chart:
+        st.subheader('Grafik Harga')
+        render_price_chart(df_gab, key, data.version, labels, start_date, end_date)
+
+    ##-----------------------------------------
+    st.subheader('List Harga')
+    # tabel bawah
+    render_price_table(df_gab, labels, start_date, end_date, key)
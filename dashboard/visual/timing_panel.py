@@ -0,0 +1,21 @@
+'''
+Panel sidebar berisi rincian waktu per tahap peramalan
+'''
+import pandas as pd
+import streamlit as st
+
+def render_timing_panel(run):
+    '''
+    Method ini menampilkan ringkasan span dari satu TimingRun di sidebar
+    '''
+    stages = pd.DataFrame(run.summary(), columns=['stage', 'depth', 'calls', 'seconds'])
+    # depth 0 = span teratas, span anak menjorok satu level per depth
+    stages['Tahap'] = ['  ' * depth + stage
+                       for stage, depth in zip(stages['stage'], stages['depth'])]
+    stages['ms'] = (stages['seconds'] * 1000).round(1)
+    stages['%'] = (stages['seconds'] / run.duration * 100).round(1)
+
+    with st.sidebar.expander("Rincian waktu", expanded=True):
+        st.write(f"Total: {run.duration * 1000:.0f} ms")
+        st.dataframe(stages[['Tahap', 'calls', 'ms', '%']], hide_index=True,
+                     use_container_width=True)